@@ -0,0 +1,214 @@
+"""
+Benchmark suite for DailyRoutine database operations
+
+Times DatabaseManager operations against generated databases of about
+1k, 100k and 1M habit logs and writes p50/p95/p99 latencies as JSON.
+Passing --baseline compares the run with an earlier results file and
+exits with status 1 when an operation got slower than the tolerance, e.g.
+
+    python benchmark.py --tiers 1k 100k --output baseline.json
+    python benchmark.py --tiers 1k 100k --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from config.constants import HABIT_CATEGORIES, HABIT_PRIORITIES, HABIT_STATUS
+from database.database import DatabaseManager
+from seed_database import seed_database
+
+# (habits, days of history) giving roughly the named number of habit logs
+TIERS = {
+    '1k': (20, 160),
+    '100k': (1000, 320),
+    '1m': (10000, 320),
+}
+# Fixed so a seed always generates the same database
+END_DAY = date(2025, 12, 31)
+FILTER_FIELDS = ['search', 'category', 'status', 'priority']
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': round(sum(samples) / len(samples), 4),
+        'p50_ms': round(percentile(samples, 0.50), 4),
+        'p95_ms': round(percentile(samples, 0.95), 4),
+        'p99_ms': round(percentile(samples, 0.99), 4),
+        'max_ms': round(samples[-1], 4),
+    }
+
+def time_calls(call: Callable[[int], Any], repeat: int, warmup: int) -> Dict[str, float]:
+    """Run call(i) warmup + repeat times and summarize the timed runs"""
+    samples = []
+    # DatabaseManager prints on every write, keep the terminal out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(warmup + repeat):
+            start = time.perf_counter()
+            call(i)
+            elapsed = (time.perf_counter() - start) * 1000
+            if i >= warmup:
+                samples.append(elapsed)
+    return summarize(samples)
+
+def tier_database(tier: str, seed: int, data_dir: Path) -> Path:
+    """Path of the generated database for a tier, generating it on first use"""
+    habits, days = TIERS[tier]
+    path = data_dir / f"{tier}_seed{seed}.db"
+    if not path.exists():
+        print(f"Generating {tier} database ({habits} habits, {days} days)...")
+        data_dir.mkdir(parents=True, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_database(str(path), habits=habits, days=days, seed=seed, end_day=END_DAY)
+    return path
+
+def filter_combinations() -> List[List[str]]:
+    """Every subset of FILTER_FIELDS, the empty one first"""
+    return [list(fields) for size in range(len(FILTER_FIELDS) + 1)
+            for fields in itertools.combinations(FILTER_FIELDS, size)]
+
+def benchmark_tier(tier: str, seed: int, data_dir: Path, repeat: int, warmup: int) -> Dict[str, Dict[str, float]]:
+    """Time every operation on a fresh copy of the tier database"""
+    source = tier_database(tier, seed, data_dir)
+    work = data_dir / f"{tier}_work.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{work}{suffix}").unlink(missing_ok=True)
+    shutil.copyfile(source, work)
+
+    db = DatabaseManager(str(work), archive_path=str(data_dir / f"{tier}_work_archive.db"))
+    rng = random.Random(seed)
+    results = {}
+    try:
+        habit_ids = [habit['id'] for habit in db.get_all_habits()]
+        rng.shuffle(habit_ids)
+        total = warmup + repeat
+
+        results['create_habit'] = time_calls(lambda i: db.create_habit({
+            'name': f"Benchmark habit {i}",
+            'category': HABIT_CATEGORIES[i % len(HABIT_CATEGORIES)],
+            'start_date': END_DAY.isoformat(),
+            'frequency': 3,
+            'priority': HABIT_PRIORITIES[i % len(HABIT_PRIORITIES)],
+        }), repeat, warmup)
+
+        values = {
+            'search': lambda i: "Membaca",
+            'category': lambda i: HABIT_CATEGORIES[i % len(HABIT_CATEGORIES)],
+            'status': lambda i: HABIT_STATUS[i % len(HABIT_STATUS)],
+            'priority': lambda i: HABIT_PRIORITIES[i % len(HABIT_PRIORITIES)],
+        }
+        for fields in filter_combinations():
+            name = "get_all_habits[" + ("+".join(fields) or "no filter") + "]"
+            results[name] = time_calls(
+                lambda i: db.get_all_habits({field: values[field](i) for field in fields}), repeat, warmup)
+
+        # Days after the generated history, so every call records a new completion
+        results['mark_habit_complete'] = time_calls(lambda i: db.mark_habit_complete(
+            habit_ids[i % len(habit_ids)], (END_DAY + timedelta(days=1 + i // len(habit_ids))).isoformat()
+        ), repeat, warmup)
+
+        results['get_statistics'] = time_calls(lambda i: db.get_statistics(), repeat, warmup)
+
+        # Distinct habits from the end of the shuffled list, each with its logs
+        doomed = habit_ids[-total:] if len(habit_ids) > total else habit_ids
+        results['delete_habit'] = time_calls(lambda i: db.delete_habit(doomed[i % len(doomed)]), repeat, warmup)
+    finally:
+        db.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{work}{suffix}").unlink(missing_ok=True)
+    return results
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, floor_ms: float) -> List[str]:
+    """Print the change against the baseline and return the regressed operations"""
+    regressions = []
+    print(f"{'tier':<6} {'operation':<48} {'base p50':>9} {'p50':>9} {'base p95':>9} {'p95':>9}  change")
+    for tier, operations in results['tiers'].items():
+        base_operations = baseline.get('tiers', {}).get(tier, {})
+        for name, stats in operations.items():
+            base = base_operations.get(name)
+            if base is None:
+                print(f"{tier:<6} {name:<48} {'-':>9} {stats['p50_ms']:>9.3f} {'-':>9} {stats['p95_ms']:>9.3f}  new")
+                continue
+            change = stats['p50_ms'] / base['p50_ms'] - 1 if base['p50_ms'] else 0.0
+            slower = any(
+                stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] > floor_ms
+                for key in ('p50_ms', 'p95_ms')
+            )
+            if slower:
+                regressions.append(f"{tier} {name}")
+            print(f"{tier:<6} {name:<48} {base['p50_ms']:>9.3f} {stats['p50_ms']:>9.3f} "
+                  f"{base['p95_ms']:>9.3f} {stats['p95_ms']:>9.3f}  {change:+.0%}{'  REGRESSION' if slower else ''}")
+    return regressions
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Table of the latencies of one run"""
+    print(f"{'tier':<6} {'operation':<48} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for tier, operations in results['tiers'].items():
+        for name, stats in operations.items():
+            print(f"{tier:<6} {name:<48} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+def main():
+    """Run the benchmarks and optionally compare them with a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark DailyRoutine database operations")
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=['1k', '100k'], help="database sizes to run")
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per operation")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per operation")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the generated databases")
+    parser.add_argument("--data-dir", default="database/benchmarks", help="where generated databases are kept")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging, 0.2 = 20%%")
+    parser.add_argument("--floor-ms", type=float, default=0.2, help="ignore slowdowns smaller than this many ms")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+        },
+        'tiers': {},
+    }
+    for tier in args.tiers:
+        print(f"Benchmarking {tier}...")
+        results['tiers'][tier] = benchmark_tier(tier, args.seed, Path(args.data_dir), args.repeat, args.warmup)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote results to {args.output}")
+
+    if not args.baseline:
+        print_results(results)
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+    if regressions:
+        print(f"{len(regressions)} operations regressed by more than {args.tolerance:.0%}: " + ", ".join(regressions))
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+if __name__ == '__main__':
+    main()
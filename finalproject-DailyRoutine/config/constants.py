@@ -13,11 +13,34 @@ NIM = "F1D02310141"
 DATABASE_NAME = "habits.db"
 DATABASE_PATH = "database/habits.db"
 
+# SQLite connection tuning
+DB_JOURNAL_MODE = "WAL"
+DB_SYNCHRONOUS = "NORMAL"
+DB_BUSY_TIMEOUT_MS = 5000
+DB_CACHE_SIZE_KB = 16384
+HABIT_CACHE_SIZE = 1024  # habits kept in the in-process LRU cache
+
+# Query profiler, also switched on by DAILYROUTINE_PROFILE=1. Slow queries
+# are logged next to the main database as <name>_slow_queries.log
+DB_PROFILE = False
+DB_SLOW_QUERY_MS = 50  # overridden by DAILYROUTINE_SLOW_QUERY_MS
+
+# Habit log archive (stored next to the main database as <name>_archive.db)
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 5000
+
+# Online backups (stored in a backups folder next to the main database)
+BACKUP_PAGES_PER_STEP = 256  # pages copied between progress callbacks
+BACKUP_KEEP = 7  # newest backups kept by rotation
+BACKUP_INTERVAL_HOURS = 24  # scheduled backup interval while the app runs
+
 # UI Configuration
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 MIN_WINDOW_WIDTH = 800
 MIN_WINDOW_HEIGHT = 600
+HABITS_PAGE_SIZE = 200
+SEARCH_DEBOUNCE_MS = 150  # typing pause before the habit list is filtered
 
 # Habit Categories
 HABIT_CATEGORIES = [
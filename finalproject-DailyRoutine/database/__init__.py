@@ -2,6 +2,12 @@
 Database module for DailyRoutine application
 """
 
-from .database import DatabaseManager, db_manager
+from .database import DatabaseManager, get_db_manager
 
-__all__ = ['DatabaseManager', 'db_manager']
+__all__ = ['DatabaseManager', 'get_db_manager']
+
+def __getattr__(name):
+    """Resolve db_manager lazily so importing the package stays cheap"""
+    if name == 'db_manager':
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,18 +2,69 @@
 Database operations for DailyRoutine application
 """
 
+import calendar
+import re
 import sqlite3
-from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from pathlib import Path
 
-from config.constants import DATABASE_PATH, HABIT_CATEGORIES, HABIT_PRIORITIES, HABIT_STATUS
+from .cache import LRUCache
+from .profiler import QueryProfiler
+
+from config.constants import (
+    DATABASE_PATH, HABIT_CATEGORIES, HABIT_PRIORITIES, HABIT_STATUS, HABITS_PAGE_SIZE,
+    HABIT_CACHE_SIZE, ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, DB_JOURNAL_MODE, DB_SYNCHRONOUS, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB,
+    BACKUP_PAGES_PER_STEP, BACKUP_KEEP, COLORS
+)
+from utils.helpers import (
+    date_to_day_number, day_number_to_date, format_day_number, datetime_to_epoch, format_epoch,
+    create_backup_filename
+)
+
+# Bump when the schema changes so existing databases run _create_tables again
+SCHEMA_VERSION = 5
+
+# Days are stored as day numbers (days since 1970-01-01, a Thursday) and
+# timestamps as Unix epoch seconds. Rollup periods start on the Monday of
+# the ISO week or the first of the month.
+ROLLUP_PERIODS = {
+    'week': "({day} - ({day} + 3) % 7)",
+    'month': "CAST(julianday(date({day} * 86400, 'unixepoch', 'start of month')) - 2440587.5 AS INTEGER)",
+}
+
+# Convert the ISO TEXT dates and local timestamps written by older versions
+ISO_TO_DAY_SQL = "CAST(julianday(substr({value}, 1, 10)) - 2440587.5 AS INTEGER)"
+ISO_TO_EPOCH_SQL = "CAST(strftime('%s', {value}, 'utc') AS INTEGER)"
 
 class DatabaseManager:
     """SQLite database manager for habits"""
 
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, archive_path: Optional[str] = None,
+                 profiler: Optional[QueryProfiler] = None):
         self.db_path = db_path
+        # Old habit logs move to this file, attached as "archive" when needed
+        self.archive_path = archive_path or str(Path(db_path).with_name(f"{Path(db_path).stem}_archive.db"))
+        # None unless profiling is switched on, then every statement is timed
+        self.profiler = profiler or QueryProfiler.from_environment(
+            log_path=str(Path(db_path).with_name(f"{Path(db_path).stem}_slow_queries.log"))
+        )
+        if self.profiler is not None:
+            self._profile_operations()
+        self._owner_thread = threading.get_ident()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Thread id -> (the thread when Python started it, its connection).
+        # Keyed by id rather than threading.local, which PyQt resets between
+        # the jobs it runs on one QThreadPool thread.
+        self._thread_connections: Dict[int, Tuple[Optional[threading.Thread], sqlite3.Connection]] = {}
+        self._connections_lock = threading.Lock()
+        self._fts_enabled = False
+        # Read-through caches, invalidated by the write methods after commit
+        self._habit_cache = LRUCache(HABIT_CACHE_SIZE)
+        self._category_cache = LRUCache(1)
+        # Callables told about every committed change to habits
+        self._change_listeners: List[Callable[[Dict[str, Any]], None]] = []
         self._ensure_database_directory()
         self._create_tables()
 
@@ -21,43 +72,115 @@ class DatabaseManager:
         """Ensure database directory exists"""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
+    def _profile_operations(self) -> None:
+        """Time every public method as a logical operation of the profiler"""
+        for name in dir(type(self)):
+            if name.startswith('_') or name in ('close', 'get_query_profile'):
+                continue
+            method = getattr(self, name)
+            if callable(method):
+                setattr(self, name, self.profiler.wrap_operation(name, method))
+
+    def get_query_profile(self) -> Optional[Dict[str, Any]]:
+        """Latency histograms, slow query count and full scans, None when profiling is off"""
+        return self.profiler.report() if self.profiler is not None else None
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection and apply the performance pragmas"""
+        # Each connection is only ever used by the thread that opened it; the
+        # flag is relaxed so close() can release worker connections too.
+        if self.profiler is not None:
+            conn = self.profiler.connect(self.db_path, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode = {DB_JOURNAL_MODE}")
+        conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size = -{int(DB_CACHE_SIZE_KB)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the long-lived connection for the calling thread"""
+        ident = threading.get_ident()
+        if ident == self._owner_thread:
+            if self._conn is None:
+                self._conn = self._open_connection()
+            return self._conn
+
+        thread = threading.current_thread()
+        # Threads started outside Python (Qt pools) keep theirs until close()
+        owner = None if isinstance(thread, threading._DummyThread) else thread
+        with self._connections_lock:
+            entry = self._thread_connections.get(ident)
+            # An id can be reused by a new thread once the old one has ended
+            if entry is not None and (entry[0] is None or entry[0] is owner):
+                return entry[1]
+            finished = self._take_finished_connections()
+
+            conn = self._open_connection()
+            self._thread_connections[ident] = (owner, conn)
+
+        self._close_connections(finished)
+        return conn
+
+    def _take_finished_connections(self) -> List[sqlite3.Connection]:
+        """Forget the connections of Python threads that have ended; caller holds the lock"""
+        finished = [ident for ident, (thread, _) in self._thread_connections.items()
+                    if thread is not None and not thread.is_alive()]
+        return [self._thread_connections.pop(ident)[1] for ident in finished]
+
+    def thread_connection_count(self) -> int:
+        """Worker-thread connections currently open"""
+        with self._connections_lock:
+            return len(self._thread_connections)
+
+    def _close_connections(self, connections: List[sqlite3.Connection]) -> None:
+        """Close connections, reporting failures"""
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+
+    def close(self) -> None:
+        """Close the main connection and every worker-thread connection"""
+        with self._connections_lock:
+            connections = [conn for _, conn in self._thread_connections.values()]
+            self._thread_connections = {}
+
+        if self._conn is not None:
+            connections.append(self._conn)
+            self._conn = None
+
+        self._close_connections(connections)
+
+        if self.profiler is not None:
+            print(self.profiler.format_report())
+
     def _create_tables(self) -> None:
         """Create database tables if they don't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
+                # A database stamped with the current version needs no DDL at all
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'habits_fts'")
+                    self._fts_enabled = cursor.fetchone() is not None
+                    return
+
+                # Tables may be rebuilt by the migration, keep cascades from firing
+                cursor.execute("PRAGMA foreign_keys = OFF")
+
                 # Create habits table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS habits (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL UNIQUE,
-                        category TEXT NOT NULL,
-                        start_date TEXT NOT NULL,
-                        frequency INTEGER NOT NULL CHECK (frequency >= 1 AND frequency <= 7),
-                        status TEXT NOT NULL DEFAULT 'Belum',
-                        notes TEXT,
-                        priority TEXT NOT NULL DEFAULT 'Medium',
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL,
-                        target_weekly INTEGER NOT NULL DEFAULT 1,
-                        streak_count INTEGER NOT NULL DEFAULT 0,
-                        total_completed INTEGER NOT NULL DEFAULT 0
-                    )
-                """)
+                cursor.execute(self._HABITS_TABLE_SQL.format(table='habits'))
 
                 # Create habit_logs table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS habit_logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        habit_id INTEGER NOT NULL,
-                        date TEXT NOT NULL,
-                        completed BOOLEAN NOT NULL DEFAULT 0,
-                        notes TEXT,
-                        created_at TEXT NOT NULL,
-                        FOREIGN KEY (habit_id) REFERENCES habits (id) ON DELETE CASCADE
-                    )
-                """)
+                cursor.execute(self._HABIT_LOGS_TABLE_SQL.format(table='habit_logs'))
 
                 # Create categories table
                 cursor.execute("""
@@ -69,24 +192,496 @@ class DatabaseManager:
                     )
                 """)
 
+                # Insert default categories if they don't exist
+                self._insert_default_categories(cursor)
+
+                # Create app_meta table for settings such as the archive cutoff
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS app_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    ) WITHOUT ROWID
+                """)
+
+                # Bring tables created by older versions up to date
+                self._migrate_schema(cursor)
+
                 # Create indexes for better performance
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_category ON habits(category)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_category_id ON habits(category_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_status ON habits(status)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_priority ON habits(priority)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_created_at ON habits(created_at)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_id ON habit_logs(habit_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_habits_created_at_id ON habits(created_at, id)")
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_habit_logs_habit_day
+                    ON habit_logs(habit_id, date)
+                """)
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_habit_logs_date ON habit_logs(date)")
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_date_completed
+                    ON habit_logs(habit_id, date, completed)
+                """)
 
-                # Insert default categories if they don't exist
-                self._insert_default_categories(cursor)
+                # Per-status/category/priority counters for the dashboard
+                self._create_stats_table(cursor)
 
+                # Per-habit weekly and monthly completion counts
+                self._create_rollup_table(cursor)
+
+                # Full-text search index over habit name and notes
+                self._fts_enabled = self._create_search_index(cursor)
+
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
                 conn.commit()
+                cursor.execute("PRAGMA foreign_keys = ON")
                 print("Database tables created successfully")
 
         except sqlite3.Error as e:
             print(f"Error creating database tables: {e}")
             raise
 
+    _HABITS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            category_id INTEGER NOT NULL REFERENCES categories (id),
+            start_date INTEGER NOT NULL,
+            frequency INTEGER NOT NULL CHECK (frequency >= 1 AND frequency <= 7),
+            status TEXT NOT NULL DEFAULT 'Belum',
+            notes TEXT,
+            priority TEXT NOT NULL DEFAULT 'Medium',
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL,
+            target_weekly INTEGER NOT NULL DEFAULT 1,
+            streak_count INTEGER NOT NULL DEFAULT 0,
+            total_completed INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_completed_date INTEGER
+        )
+    """
+
+    _HABIT_COLUMNS = [
+        'id', 'name', 'category_id', 'start_date', 'frequency', 'status', 'notes', 'priority',
+        'created_at', 'updated_at', 'target_weekly', 'streak_count', 'total_completed',
+        'longest_streak', 'last_completed_date'
+    ]
+
+    _HABIT_LOGS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            completed BOOLEAN NOT NULL DEFAULT 0,
+            notes TEXT,
+            created_at INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) REFERENCES habits (id) ON DELETE CASCADE
+        )
+    """
+
+    def _migrate_schema(self, cursor: sqlite3.Cursor) -> None:
+        """Add columns introduced after the first release"""
+        cursor.execute("PRAGMA table_info(habits)")
+        habit_columns = {row[1] for row in cursor.fetchall()}
+
+        # New streak columns start empty and streak_count used to be a total,
+        # so the statistics are recomputed from the logs once migrated
+        stale_statistics = False
+        if 'longest_streak' not in habit_columns:
+            cursor.execute("ALTER TABLE habits ADD COLUMN longest_streak INTEGER NOT NULL DEFAULT 0")
+            stale_statistics = True
+        if 'last_completed_date' not in habit_columns:
+            cursor.execute("ALTER TABLE habits ADD COLUMN last_completed_date INTEGER")
+            stale_statistics = True
+
+        # TEXT dates from before the integer encoding, category names from
+        # before the categories foreign key
+        encode_dates = self._column_type(cursor, 'main', 'habits', 'start_date') == 'TEXT'
+        if encode_dates or 'category' in habit_columns:
+            self._migrate_habits_table(cursor, encode_dates, 'category' in habit_columns)
+        if encode_dates:
+            self._encode_dates(cursor)
+
+        # Superseded by the covering (habit_id, date, completed) index
+        cursor.execute("DROP INDEX IF EXISTS idx_habit_logs_habit_date")
+
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_habit_logs_habit_day'
+        """)
+        if cursor.fetchone() is None and self._dedupe_habit_logs(cursor):
+            stale_statistics = True
+
+        # habit_id lookups are served by the unique (habit_id, date) index
+        cursor.execute("DROP INDEX IF EXISTS idx_habit_logs_habit_id")
+
+        # Superseded by the (created_at, id) keyset pagination index
+        cursor.execute("DROP INDEX IF EXISTS idx_habits_created_at")
+
+        if stale_statistics:
+            self._rebuild_statistics(cursor)
+
+    def _column_type(self, cursor: sqlite3.Cursor, schema: str, table: str, column: str) -> Optional[str]:
+        """Declared type of a column, None if the table or column does not exist"""
+        cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        for row in cursor.fetchall():
+            if row[1] == column:
+                return row[2].upper()
+        return None
+
+    def _rebuild_table(self, cursor: sqlite3.Cursor, table: str, create_sql: str,
+                       columns: List[str], expressions: List[str]) -> None:
+        """Copy a table into a new definition, converting columns with SQL expressions"""
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        row = cursor.fetchone()
+
+        cursor.execute(create_sql.format(table=f"{table}_rebuilt"))
+        cursor.execute(f"""
+            INSERT INTO {table}_rebuilt ({", ".join(columns)})
+            SELECT {", ".join(expressions)} FROM {table}
+        """)
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_rebuilt RENAME TO {table}")
+
+        if row is not None:
+            # Keep AUTOINCREMENT from reusing ids of rows deleted before the rebuild
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (row[0], table))
+
+    def _migrate_habits_table(self, cursor: sqlite3.Cursor, encode_dates: bool, normalize_category: bool) -> None:
+        """Rebuild habits into the current definition, converting legacy columns"""
+        converted = {}
+        if encode_dates:
+            day = lambda column: ISO_TO_DAY_SQL.format(value=column)
+            epoch = lambda column: ISO_TO_EPOCH_SQL.format(value=column)
+            converted.update({
+                'start_date': day('start_date'), 'last_completed_date': day('last_completed_date'),
+                'created_at': epoch('created_at'), 'updated_at': epoch('updated_at')
+            })
+        if normalize_category:
+            # Free-text categories may name rows the categories table never had
+            cursor.execute("""
+                INSERT OR IGNORE INTO categories (name, color)
+                SELECT DISTINCT category, ? FROM habits
+            """, (COLORS['primary'],))
+            converted['category_id'] = "(SELECT id FROM categories WHERE categories.name = habits.category)"
+            # Category counters were keyed by name, _create_stats_table reseeds them
+            cursor.execute("DROP TABLE IF EXISTS habit_stats")
+
+        self._rebuild_table(cursor, 'habits', self._HABITS_TABLE_SQL, self._HABIT_COLUMNS,
+                            [converted.get(column, column) for column in self._HABIT_COLUMNS])
+
+    def _encode_dates(self, cursor: sqlite3.Cursor) -> None:
+        """Rewrite ISO TEXT log dates as day numbers and timestamps as epoch seconds"""
+        day = lambda column: ISO_TO_DAY_SQL.format(value=column)
+        epoch = lambda column: ISO_TO_EPOCH_SQL.format(value=column)
+
+        log_columns = ['id', 'habit_id', 'date', 'completed', 'notes', 'created_at']
+        converted = {'date': day('date'), 'created_at': epoch('created_at')}
+        self._rebuild_table(cursor, 'habit_logs', self._HABIT_LOGS_TABLE_SQL, log_columns,
+                            [converted.get(column, column) for column in log_columns])
+
+        if self._column_type(cursor, 'main', 'habit_rollups', 'period') == 'TEXT':
+            rollup_columns = ['habit_id', 'granularity', 'period', 'logged_days', 'completed_days']
+            self._rebuild_table(cursor, 'habit_rollups', self._ROLLUPS_TABLE_SQL, rollup_columns,
+                                [day(column) if column == 'period' else column for column in rollup_columns])
+
+        cursor.execute(f"""
+            UPDATE app_meta SET value = {day('value')}
+            WHERE key = 'archive_cutoff' AND value LIKE '____-__-__'
+        """)
+        print("Converted stored dates to day numbers and epoch seconds")
+
+    def _create_stats_table(self, cursor: sqlite3.Cursor) -> None:
+        """Create the habit_stats summary table and the triggers that maintain it"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'habit_stats'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS habit_stats (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                habit_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            ) WITHOUT ROWID
+        """)
+
+        count_new = """
+            INSERT INTO habit_stats (dimension, value, habit_count)
+            VALUES ('status', new.status, 1), ('category', new.category_id, 1), ('priority', new.priority, 1)
+            ON CONFLICT (dimension, value) DO UPDATE SET habit_count = habit_count + 1;
+        """
+        uncount_old = """
+            UPDATE habit_stats SET habit_count = habit_count - 1
+            WHERE (dimension = 'status' AND value = old.status)
+                OR (dimension = 'category' AND value = old.category_id)
+                OR (dimension = 'priority' AND value = old.priority);
+            DELETE FROM habit_stats WHERE habit_count <= 0;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS habit_stats_insert AFTER INSERT ON habits BEGIN
+                {count_new}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS habit_stats_delete AFTER DELETE ON habits BEGIN
+                {uncount_old}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS habit_stats_update AFTER UPDATE OF status, category_id, priority ON habits
+            WHEN old.status IS NOT new.status OR old.category_id IS NOT new.category_id
+                OR old.priority IS NOT new.priority
+            BEGIN
+                {uncount_old}
+                {count_new}
+            END
+        """)
+
+        if is_new:
+            # Seed the counters from habits that existed before the table
+            cursor.execute("""
+                INSERT INTO habit_stats (dimension, value, habit_count)
+                SELECT 'status', status, COUNT(*) FROM habits GROUP BY status
+                UNION ALL
+                SELECT 'category', category_id, COUNT(*) FROM habits GROUP BY category_id
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*) FROM habits GROUP BY priority
+            """)
+
+    _ROLLUPS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            habit_id INTEGER NOT NULL,
+            granularity TEXT NOT NULL,
+            period INTEGER NOT NULL,
+            logged_days INTEGER NOT NULL DEFAULT 0,
+            completed_days INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (habit_id, granularity, period)
+        ) WITHOUT ROWID
+    """
+
+    def _create_rollup_table(self, cursor: sqlite3.Cursor) -> None:
+        """Create the habit_rollups table and the triggers that maintain it from habit_logs"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'habit_rollups'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute(self._ROLLUPS_TABLE_SQL.format(table='habit_rollups'))
+
+        new_week = ROLLUP_PERIODS['week'].format(day='new.date')
+        new_month = ROLLUP_PERIODS['month'].format(day='new.date')
+        old_week = ROLLUP_PERIODS['week'].format(day='old.date')
+        old_month = ROLLUP_PERIODS['month'].format(day='old.date')
+        count_new = f"""
+            INSERT INTO habit_rollups (habit_id, granularity, period, logged_days, completed_days)
+            VALUES (new.habit_id, 'week', {new_week}, 1, new.completed != 0),
+                (new.habit_id, 'month', {new_month}, 1, new.completed != 0)
+            ON CONFLICT (habit_id, granularity, period) DO UPDATE SET
+                logged_days = logged_days + 1,
+                completed_days = completed_days + excluded.completed_days;
+        """
+        old_periods = f"""
+            habit_id = old.habit_id AND (
+                (granularity = 'week' AND period = {old_week})
+                OR (granularity = 'month' AND period = {old_month})
+            )
+        """
+        uncount_old = f"""
+            UPDATE habit_rollups SET
+                logged_days = logged_days - 1,
+                completed_days = completed_days - (old.completed != 0)
+            WHERE {old_periods};
+            DELETE FROM habit_rollups WHERE {old_periods} AND logged_days <= 0;
+        """
+        # Recreated on every schema upgrade in case the period expressions changed
+        for trigger in ("habit_rollups_insert", "habit_rollups_delete", "habit_rollups_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        cursor.execute(f"""
+            CREATE TRIGGER habit_rollups_insert AFTER INSERT ON habit_logs BEGIN
+                {count_new}
+            END
+        """)
+        # Logs moved to the archive stay counted in their rollups
+        cursor.execute(f"""
+            CREATE TRIGGER habit_rollups_delete AFTER DELETE ON habit_logs
+            WHEN old.date >= COALESCE(
+                (SELECT CAST(value AS INTEGER) FROM app_meta WHERE key = 'archive_cutoff'), old.date
+            )
+            BEGIN
+                {uncount_old}
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habit_rollups_habit_delete AFTER DELETE ON habits BEGIN
+                DELETE FROM habit_rollups WHERE habit_id = old.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER habit_rollups_update AFTER UPDATE OF habit_id, date, completed ON habit_logs
+            WHEN old.habit_id IS NOT new.habit_id OR old.date IS NOT new.date
+                OR (old.completed != 0) IS NOT (new.completed != 0)
+            BEGIN
+                {uncount_old}
+                {count_new}
+            END
+        """)
+
+        if is_new:
+            # Seed the rollups from logs written before the table existed
+            self._fill_rollups(cursor)
+
+    def _fill_rollups(self, cursor: sqlite3.Cursor) -> int:
+        """Aggregate every habit log into habit_rollups, returns the rows written"""
+        source = self._log_source(cursor)
+        written = 0
+        for granularity, period_sql in ROLLUP_PERIODS.items():
+            period = period_sql.format(day='date')
+            cursor.execute(f"""
+                INSERT INTO habit_rollups (habit_id, granularity, period, logged_days, completed_days)
+                SELECT habit_id, ?, {period}, COUNT(*), SUM(completed != 0)
+                FROM {source}
+                GROUP BY habit_id, {period}
+            """, (granularity,))
+            written += cursor.rowcount
+        return written
+
+    def _create_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index mirroring habits, returns False when FTS5 is unavailable"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'habits_fts'")
+        is_new = cursor.fetchone() is None
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS habits_fts USING fts5(
+                    name, notes,
+                    content = 'habits', content_rowid = 'id',
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE: {e}")
+            return False
+
+        # Keep the external-content index in step with the habits table
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_insert AFTER INSERT ON habits BEGIN
+                INSERT INTO habits_fts (rowid, name, notes) VALUES (new.id, new.name, new.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_delete AFTER DELETE ON habits BEGIN
+                INSERT INTO habits_fts (habits_fts, rowid, name, notes)
+                VALUES ('delete', old.id, old.name, old.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS habits_fts_update AFTER UPDATE OF name, notes ON habits BEGIN
+                INSERT INTO habits_fts (habits_fts, rowid, name, notes)
+                VALUES ('delete', old.id, old.name, old.notes);
+                INSERT INTO habits_fts (rowid, name, notes) VALUES (new.id, new.name, new.notes);
+            END
+        """)
+
+        if is_new:
+            # Index habits that existed before the search index
+            cursor.execute("INSERT INTO habits_fts (habits_fts) VALUES ('rebuild')")
+        return True
+
+    def _build_search_query(self, text: str) -> str:
+        """Turn user input into an FTS5 prefix query, one quoted term per word"""
+        terms = re.findall(r"\w+", text)
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def _get_archive_cutoff(self, cursor: sqlite3.Cursor) -> Optional[date]:
+        """Day before which habit logs live in the archive, or None if nothing was archived"""
+        cursor.execute("SELECT value FROM app_meta WHERE key = 'archive_cutoff'")
+        row = cursor.fetchone()
+        return day_number_to_date(int(row[0])) if row else None
+
+    def _is_archive_attached(self, cursor: sqlite3.Cursor) -> bool:
+        """Whether the archive database is attached to this cursor's connection"""
+        cursor.execute("PRAGMA database_list")
+        return any(row[1] == 'archive' for row in cursor.fetchall())
+
+    _ARCHIVE_LOGS_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS archive.{table} (
+            id INTEGER PRIMARY KEY,
+            habit_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            completed BOOLEAN NOT NULL DEFAULT 0,
+            notes TEXT,
+            created_at INTEGER NOT NULL
+        )
+    """
+
+    def _attach_archive(self, conn: sqlite3.Connection, since: Optional[date] = None,
+                        create: bool = False) -> bool:
+        """ATTACH the archive when logs from since (None meaning any day) may live there
+
+        Must run outside a transaction. Returns whether the archive is attached.
+        """
+        cursor = conn.cursor()
+        if self._is_archive_attached(cursor):
+            return True
+        if not create:
+            cutoff = self._get_archive_cutoff(cursor)
+            if cutoff is None or (since is not None and since >= cutoff):
+                return False
+            if not Path(self.archive_path).exists():
+                return False
+
+        cursor.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+        if self._column_type(cursor, 'archive', 'habit_logs', 'date') == 'TEXT':
+            # Archive written before the integer date encoding
+            with conn:
+                cursor.execute(self._ARCHIVE_LOGS_TABLE_SQL.format(table='habit_logs_rebuilt'))
+                cursor.execute(f"""
+                    INSERT INTO archive.habit_logs_rebuilt (id, habit_id, date, completed, notes, created_at)
+                    SELECT id, habit_id, {ISO_TO_DAY_SQL.format(value='date')}, completed, notes,
+                        {ISO_TO_EPOCH_SQL.format(value='created_at')}
+                    FROM archive.habit_logs
+                """)
+                cursor.execute("DROP TABLE archive.habit_logs")
+                cursor.execute("ALTER TABLE archive.habit_logs_rebuilt RENAME TO habit_logs")
+        cursor.execute(self._ARCHIVE_LOGS_TABLE_SQL.format(table='habit_logs'))
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_archived_logs_habit_day
+            ON habit_logs(habit_id, date)
+        """)
+        return True
+
+    def _log_source(self, cursor: sqlite3.Cursor) -> str:
+        """Table expression over every habit log, archived ones included when attached"""
+        if not self._is_archive_attached(cursor):
+            return "habit_logs"
+        return """(
+            SELECT habit_id, date, completed FROM main.habit_logs
+            UNION ALL
+            SELECT habit_id, date, completed FROM archive.habit_logs
+        )"""
+
+    def _check_not_archived(self, cursor: sqlite3.Cursor, day: date) -> None:
+        """Refuse writes to days whose logs were moved to the archive"""
+        cutoff = self._get_archive_cutoff(cursor)
+        if cutoff is not None and day < cutoff:
+            raise ValueError(f"Logs before {cutoff.isoformat()} are archived and can no longer change")
+
+    def _dedupe_habit_logs(self, cursor: sqlite3.Cursor) -> bool:
+        """Keep one log per habit and day before the unique index is created, True if any were removed"""
+        cursor.execute("""
+            DELETE FROM habit_logs WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY habit_id, date ORDER BY completed DESC, id
+                    ) AS copy_number
+                    FROM habit_logs
+                )
+                WHERE copy_number > 1
+            )
+        """)
+        if cursor.rowcount > 0:
+            print(f"Removed {cursor.rowcount} duplicate habit logs")
+            return True
+        return False
+
     def _insert_default_categories(self, cursor: sqlite3.Cursor) -> None:
         """Insert default categories"""
         default_categories = [
@@ -106,38 +701,82 @@ class DatabaseManager:
                 VALUES (?, ?, ?)
             """, (name, color, icon))
 
-    def _get_current_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        return datetime.now().isoformat()
+    def _get_current_timestamp(self) -> int:
+        """Get current timestamp in epoch seconds"""
+        return datetime_to_epoch()
+
+    def _decode_habit(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Turn a stored habit row into a dict with ISO date strings and its category name"""
+        habit = dict(row)
+        category = self._get_category(habit['category_id'])
+        habit['category'] = category['name'] if category else None
+        habit['category_color'] = category['color'] if category else None
+        habit['start_date'] = format_day_number(habit['start_date'])
+        habit['last_completed_date'] = format_day_number(habit['last_completed_date'])
+        # Kept raw as well, it orders habits like the (created_at, id) keyset does
+        habit['created_at_epoch'] = habit['created_at']
+        habit['created_at'] = format_epoch(habit['created_at'])
+        habit['updated_at'] = format_epoch(habit['updated_at'])
+        return habit
+
+    _INSERT_HABIT_SQL = """
+        INSERT INTO habits (
+            name, category_id, start_date, frequency, status, notes,
+            priority, created_at, updated_at, target_weekly
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _UPDATE_HABIT_SQL = """
+        UPDATE habits SET
+            name = ?, category_id = ?, start_date = ?, frequency = ?,
+            status = ?, notes = ?, priority = ?, updated_at = ?,
+            target_weekly = ?
+        WHERE id = ?
+    """
+
+    def _habit_insert_params(self, habit_data: Dict[str, Any], current_time: int) -> Tuple:
+        """Build the parameter tuple for _INSERT_HABIT_SQL"""
+        return (
+            habit_data['name'],
+            self._require_category_id(habit_data['category']),
+            date_to_day_number(habit_data['start_date']),
+            habit_data['frequency'],
+            habit_data.get('status', 'Belum'),
+            habit_data.get('notes', ''),
+            habit_data.get('priority', 'Medium'),
+            current_time,
+            current_time,
+            habit_data.get('target_weekly', 1)
+        )
+
+    def _habit_update_params(self, habit_id: int, habit_data: Dict[str, Any], current_time: int) -> Tuple:
+        """Build the parameter tuple for _UPDATE_HABIT_SQL"""
+        return (
+            habit_data['name'],
+            self._require_category_id(habit_data['category']),
+            date_to_day_number(habit_data['start_date']),
+            habit_data['frequency'],
+            habit_data.get('status', 'Belum'),
+            habit_data.get('notes', ''),
+            habit_data.get('priority', 'Medium'),
+            current_time,
+            habit_data.get('target_weekly', 1),
+            habit_id
+        )
 
     def create_habit(self, habit_data: Dict[str, Any]) -> int:
         """Create a new habit"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
                 current_time = self._get_current_timestamp()
 
-                cursor.execute("""
-                    INSERT INTO habits (
-                        name, category, start_date, frequency, status, notes,
-                        priority, created_at, updated_at, target_weekly
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    habit_data['name'],
-                    habit_data['category'],
-                    habit_data['start_date'],
-                    habit_data['frequency'],
-                    habit_data.get('status', 'Belum'),
-                    habit_data.get('notes', ''),
-                    habit_data.get('priority', 'Medium'),
-                    current_time,
-                    current_time,
-                    habit_data.get('target_weekly', 1)
-                ))
+                cursor.execute(self._INSERT_HABIT_SQL, self._habit_insert_params(habit_data, current_time))
 
                 habit_id = cursor.lastrowid
                 conn.commit()
+                self._habits_changed(cursor, inserted=[habit_id])
                 print(f"Habit created with ID: {habit_id}")
                 return habit_id
 
@@ -151,35 +790,19 @@ class DatabaseManager:
     def update_habit(self, habit_id: int, habit_data: Dict[str, Any]) -> bool:
         """Update an existing habit"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
                 current_time = self._get_current_timestamp()
 
-                cursor.execute("""
-                    UPDATE habits SET
-                        name = ?, category = ?, start_date = ?, frequency = ?,
-                        status = ?, notes = ?, priority = ?, updated_at = ?,
-                        target_weekly = ?
-                    WHERE id = ?
-                """, (
-                    habit_data['name'],
-                    habit_data['category'],
-                    habit_data['start_date'],
-                    habit_data['frequency'],
-                    habit_data.get('status', 'Belum'),
-                    habit_data.get('notes', ''),
-                    habit_data.get('priority', 'Medium'),
-                    current_time,
-                    habit_data.get('target_weekly', 1),
-                    habit_id
-                ))
+                cursor.execute(self._UPDATE_HABIT_SQL, self._habit_update_params(habit_id, habit_data, current_time))
 
                 if cursor.rowcount == 0:
                     print(f"Warning: Habit with ID {habit_id} not found for update")
                     return False
 
                 conn.commit()
+                self._habits_changed(cursor, updated=[habit_id])
                 print(f"Habit {habit_id} updated successfully")
                 return True
 
@@ -193,7 +816,7 @@ class DatabaseManager:
     def delete_habit(self, habit_id: int) -> bool:
         """Delete a habit"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
@@ -203,6 +826,7 @@ class DatabaseManager:
                     return False
 
                 conn.commit()
+                self._habits_changed(cursor, deleted=[habit_id])
                 print(f"Habit {habit_id} deleted successfully")
                 return True
 
@@ -210,61 +834,378 @@ class DatabaseManager:
             print(f"Error deleting habit: {e}")
             raise
 
+    def add_change_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call listener(change) after every committed write to habits
+
+        change holds 'inserted' and 'updated' lists of the new rows, a
+        'deleted' list of ids and a 'reload' flag set when too much changed
+        to describe. Listeners run on the thread that made the write.
+        """
+        self._change_listeners = self._change_listeners + [listener]
+
+    def remove_change_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Stop calling a listener added by add_change_listener"""
+        self._change_listeners = [item for item in self._change_listeners if item != listener]
+
+    def _publish_change(self, inserted: Optional[List[Dict[str, Any]]] = None,
+                        updated: Optional[List[Dict[str, Any]]] = None,
+                        deleted: Optional[List[int]] = None, reload: bool = False) -> None:
+        """Hand a change to every listener"""
+        change = {
+            'inserted': inserted or [],
+            'updated': updated or [],
+            'deleted': deleted or [],
+            'reload': reload,
+        }
+        for listener in self._change_listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Error in change listener: {e}")
+
+    def _habits_changed(self, cursor: sqlite3.Cursor, inserted: Optional[List[int]] = None,
+                        updated: Optional[List[int]] = None, deleted: Optional[List[int]] = None) -> None:
+        """Drop cached copies of committed changes and publish them with their new rows"""
+        inserted, updated, deleted = inserted or [], updated or [], deleted or []
+        self._habit_cache.invalidate(*inserted, *updated, *deleted)
+        if not self._change_listeners:
+            return
+
+        rows = {}
+        for chunk in self._chunked(inserted + updated):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT * FROM habits WHERE id IN ({placeholders})", chunk)
+            rows.update((row['id'], self._decode_habit(row)) for row in cursor.fetchall())
+
+        self._publish_change(
+            inserted=[rows[habit_id] for habit_id in inserted if habit_id in rows],
+            updated=[rows[habit_id] for habit_id in updated if habit_id in rows],
+            deleted=deleted
+        )
+
+    def _chunked(self, items: List[Any], size: int = 500):
+        """Yield successive slices small enough for one IN (...) list"""
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def _existing_habit_ids(self, cursor: sqlite3.Cursor, habit_ids: List[int]) -> set:
+        """Return the subset of habit_ids that exist"""
+        existing = set()
+        for chunk in self._chunked(list(set(habit_ids))):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"SELECT id FROM habits WHERE id IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    def bulk_create_habits(self, habits_data: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Create many habits in one transaction, returns the new id per row (None for a duplicate name)"""
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                names = [habit['name'] for habit in habits_data]
+                taken = set()
+                for chunk in self._chunked(list(set(names))):
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(f"SELECT name FROM habits WHERE name IN ({placeholders})", chunk)
+                    taken.update(row[0] for row in cursor.fetchall())
+
+                current_time = self._get_current_timestamp()
+                rows = []
+                for habit in habits_data:
+                    if habit['name'] not in taken:
+                        taken.add(habit['name'])
+                        rows.append(self._habit_insert_params(habit, current_time))
+                cursor.executemany(self._INSERT_HABIT_SQL, rows)
+
+                new_ids = {}
+                inserted_names = [row[0] for row in rows]
+                for chunk in self._chunked(inserted_names):
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(f"SELECT name, id FROM habits WHERE name IN ({placeholders})", chunk)
+                    new_ids.update((row[0], row[1]) for row in cursor.fetchall())
+
+            # Only the first row carrying a new name was inserted
+            self._habits_changed(conn.cursor(), inserted=sorted(new_ids.values()))
+            results = []
+            for name in names:
+                results.append(new_ids.pop(name, None))
+
+            print(f"Bulk created {len(rows)} of {len(habits_data)} habits")
+            return results
+
+        except sqlite3.IntegrityError as e:
+            print(f"Integrity error bulk creating habits: {e}")
+            raise ValueError(f"Invalid habit data: {e}")
+        except sqlite3.Error as e:
+            print(f"Error bulk creating habits: {e}")
+            raise
+
+    def bulk_update_habits(self, habits_data: List[Dict[str, Any]]) -> List[bool]:
+        """Update many habits (each dict carries its 'id') in one transaction, returns whether each was found"""
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                existing = self._existing_habit_ids(cursor, [habit['id'] for habit in habits_data])
+                current_time = self._get_current_timestamp()
+                cursor.executemany(self._UPDATE_HABIT_SQL, [
+                    self._habit_update_params(habit['id'], habit, current_time)
+                    for habit in habits_data if habit['id'] in existing
+                ])
+
+            self._habits_changed(conn.cursor(), updated=sorted(existing))
+            print(f"Bulk updated {len(existing)} habits")
+            return [habit['id'] in existing for habit in habits_data]
+
+        except sqlite3.IntegrityError as e:
+            print(f"Integrity error bulk updating habits: {e}")
+            raise ValueError("Habit name already exists")
+        except sqlite3.Error as e:
+            print(f"Error bulk updating habits: {e}")
+            raise
+
+    def bulk_mark_complete(self, habit_ids: List[int], dates: List[str]) -> Dict[Tuple[int, str], bool]:
+        """Mark every habit complete on every date in one transaction
+
+        Returns, per (habit_id, date), whether the day became completed.
+        Statistics are recomputed once per affected habit.
+        """
+        days = sorted({date_to_day_number(self._parse_day(value)) for value in dates})
+        pairs = list(dict.fromkeys((habit_id, day) for habit_id in habit_ids for day in days))
+        results = {(habit_id, format_day_number(day)): False for habit_id, day in pairs}
+        if not results:
+            return results
+
+        try:
+            conn = self._get_connection()
+            self._attach_archive(conn)
+            with conn:
+                cursor = conn.cursor()
+                self._check_not_archived(cursor, day_number_to_date(days[0]))
+                cursor.execute("BEGIN IMMEDIATE")
+
+                existing = self._existing_habit_ids(cursor, habit_ids)
+                already_completed = set()
+                for chunk in self._chunked(sorted(existing)):
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(f"""
+                        SELECT habit_id, date FROM habit_logs
+                        WHERE habit_id IN ({placeholders}) AND date BETWEEN ? AND ?
+                            AND completed = 1
+                    """, chunk + [days[0], days[-1]])
+                    already_completed.update((row[0], row[1]) for row in cursor.fetchall())
+
+                new_pairs = [
+                    pair for pair in pairs
+                    if pair[0] in existing and pair not in already_completed
+                ]
+                current_time = self._get_current_timestamp()
+                cursor.executemany("""
+                    INSERT INTO habit_logs (habit_id, date, completed, created_at)
+                    VALUES (?, ?, 1, ?)
+                    ON CONFLICT (habit_id, date) DO UPDATE SET completed = 1
+                """, [(habit_id, day, current_time) for habit_id, day in new_pairs])
+
+                affected = sorted({habit_id for habit_id, _ in new_pairs})
+                if affected:
+                    cursor.executemany("UPDATE habits SET updated_at = ? WHERE id = ?",
+                                       [(current_time, habit_id) for habit_id in affected])
+                    self._rebuild_statistics(cursor, affected)
+
+            for habit_id, day in new_pairs:
+                results[(habit_id, format_day_number(day))] = True
+            self._habits_changed(conn.cursor(), updated=affected)
+
+            print(f"Bulk marked {len(new_pairs)} completions for {len(affected)} habits")
+            return results
+
+        except sqlite3.Error as e:
+            print(f"Error bulk marking habits complete: {e}")
+            raise
+
+    def bulk_delete_habits(self, habit_ids: List[int]) -> List[bool]:
+        """Delete many habits in one transaction, returns whether each was found"""
+        try:
+            conn = self._get_connection()
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                existing = self._existing_habit_ids(cursor, habit_ids)
+                cursor.executemany("DELETE FROM habits WHERE id = ?",
+                                   [(habit_id,) for habit_id in existing])
+
+            self._habits_changed(conn.cursor(), deleted=sorted(existing))
+            print(f"Bulk deleted {len(existing)} habits")
+            return [habit_id in existing for habit_id in habit_ids]
+
+        except sqlite3.Error as e:
+            print(f"Error bulk deleting habits: {e}")
+            raise
+
     def get_habit(self, habit_id: int) -> Optional[Dict[str, Any]]:
         """Get a habit by ID"""
+        cached = self._habit_cache.get(habit_id)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            token = self._habit_cache.token()
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("SELECT * FROM habits WHERE id = ?", (habit_id,))
                 row = cursor.fetchone()
 
                 if row:
-                    return dict(row)
+                    habit = self._decode_habit(row)
+                    self._habit_cache.put(habit_id, dict(habit), token)
+                    return habit
                 return None
 
         except sqlite3.Error as e:
             print(f"Error getting habit: {e}")
             raise
 
+    def _cache_habits(self, habits: List[Dict[str, Any]], token: int) -> None:
+        """Keep copies of freshly listed habits so get_habit can skip the database"""
+        for habit in habits[:self._habit_cache.capacity]:
+            self._habit_cache.put(habit['id'], dict(habit), token)
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters of the read caches"""
+        return {
+            'habits': self._habit_cache.stats(),
+            'categories': self._category_cache.stats(),
+        }
+
+    def _build_habit_filters(self, filters: Optional[Dict[str, Any]]) -> Tuple[str, str, List[Any], bool]:
+        """Build the FROM and WHERE clauses for habit filters
+
+        Returns (from_clause, where_clause, params, is_ranked) where is_ranked
+        tells whether the full-text index was joined and bm25 can be used.
+        """
+        from_clause = " FROM habits"
+        where = " WHERE 1=1"
+        params = []
+        is_ranked = False
+
+        if filters:
+            if filters.get('search'):
+                search_query = self._build_search_query(filters['search'])
+                if self._fts_enabled and search_query:
+                    # Indexed prefix match through the full-text index
+                    from_clause += " JOIN habits_fts ON habits_fts.rowid = habits.id"
+                    where += " AND habits_fts MATCH ?"
+                    params.append(search_query)
+                    is_ranked = True
+                else:
+                    where += " AND (name LIKE ? OR notes LIKE ?)"
+                    search_term = f"%{filters['search']}%"
+                    params.extend([search_term, search_term])
+
+            if filters.get('category'):
+                where += " AND category_id = ?"
+                params.append(self.get_category_id(filters['category']))
+
+            if filters.get('status'):
+                where += " AND status = ?"
+                params.append(filters['status'])
+
+            if filters.get('priority'):
+                where += " AND priority = ?"
+                params.append(filters['priority'])
+
+        return from_clause, where, params, is_ranked
+
     def get_all_habits(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get all habits with optional filters"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            token = self._habit_cache.token()
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
-                query = "SELECT * FROM habits WHERE 1=1"
-                params = []
+                from_clause, where, params, is_ranked = self._build_habit_filters(filters)
+                if is_ranked:
+                    # Best bm25 score first, name weighs more than notes
+                    order_by = " ORDER BY bm25(habits_fts, 10.0, 1.0), created_at DESC, id DESC"
+                else:
+                    order_by = " ORDER BY created_at DESC, id DESC"
 
-                if filters:
-                    if filters.get('category'):
-                        query += " AND category = ?"
-                        params.append(filters['category'])
+                cursor.execute("SELECT habits.*" + from_clause + where + order_by, params)
+                habits = [self._decode_habit(row) for row in cursor.fetchall()]
 
-                    if filters.get('status'):
-                        query += " AND status = ?"
-                        params.append(filters['status'])
+                self._cache_habits(habits, token)
+                return habits
 
-                    if filters.get('priority'):
-                        query += " AND priority = ?"
-                        params.append(filters['priority'])
+        except sqlite3.Error as e:
+            print(f"Error getting habits: {e}")
+            raise
 
-                    if filters.get('search'):
-                        query += " AND (name LIKE ? OR notes LIKE ?)"
-                        search_term = f"%{filters['search']}%"
-                        params.extend([search_term, search_term])
+    def get_habits_page(self, after: Optional[Tuple[int, int]] = None, limit: int = HABITS_PAGE_SIZE,
+                        filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[int, int]]]:
+        """Get one page of habits, newest first, starting after a (created_at, id) cursor
 
-                query += " ORDER BY created_at DESC"
+        Returns the rows and the cursor for the next page, or None on the last page.
+        """
+        try:
+            token = self._habit_cache.token()
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
 
-                cursor.execute(query, params)
+                from_clause, where, params, _ = self._build_habit_filters(filters)
+                if after is not None:
+                    # Seek straight to the cursor on the (created_at, id) index
+                    where += " AND (habits.created_at, habits.id) < (?, ?)"
+                    params.extend(after)
+
+                cursor.execute(
+                    "SELECT habits.*" + from_clause + where
+                    + " ORDER BY habits.created_at DESC, habits.id DESC LIMIT ?",
+                    params + [limit + 1]
+                )
                 rows = cursor.fetchall()
 
-                return [dict(row) for row in rows]
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+
+                habits = [self._decode_habit(row) for row in rows]
+                self._cache_habits(habits, token)
+                return habits, next_cursor
 
         except sqlite3.Error as e:
-            print(f"Error getting habits: {e}")
+            print(f"Error getting habits page: {e}")
+            raise
+
+    def iter_habits(self, filters: Optional[Dict[str, Any]] = None,
+                    chunk_size: int = HABITS_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream habits newest first, fetching one page at a time"""
+        after = None
+        while True:
+            rows, after = self.get_habits_page(after=after, limit=chunk_size, filters=filters)
+            yield from rows
+            if after is None:
+                return
+
+    def count_habits(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count habits matching the filters"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+
+                from_clause, where, params, _ = self._build_habit_filters(filters)
+                cursor.execute("SELECT COUNT(*)" + from_clause + where, params)
+                return cursor.fetchone()[0]
+
+        except sqlite3.Error as e:
+            print(f"Error counting habits: {e}")
             raise
 
     def mark_habit_complete(self, habit_id: int, completion_date: str = None) -> bool:
@@ -272,35 +1213,34 @@ class DatabaseManager:
         try:
             if completion_date is None:
                 completion_date = date.today().isoformat()
+            day = self._parse_day(completion_date)
+            completion_date = day.isoformat()
 
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._get_connection()
+            # Streaks reaching back past the cutoff continue in the archive
+            self._attach_archive(conn)
+            with conn:
                 cursor = conn.cursor()
+                self._check_not_archived(cursor, day)
 
-                # Check if log already exists for this date
+                # Insert the day, or flip an uncompleted one; an already
+                # completed day is left alone and reports no change
                 cursor.execute("""
-                    SELECT id FROM habit_logs
-                    WHERE habit_id = ? AND date = ?
-                """, (habit_id, completion_date))
+                    INSERT INTO habit_logs (habit_id, date, completed, created_at)
+                    VALUES (?, ?, 1, ?)
+                    ON CONFLICT (habit_id, date) DO UPDATE SET completed = 1
+                    WHERE completed = 0
+                """, (habit_id, date_to_day_number(day), self._get_current_timestamp()))
 
-                existing_log = cursor.fetchone()
-
-                if existing_log:
-                    # Update existing log
-                    cursor.execute("""
-                        UPDATE habit_logs SET completed = 1, updated_at = ?
-                        WHERE habit_id = ? AND date = ?
-                    """, (self._get_current_timestamp(), habit_id, completion_date))
-                else:
-                    # Create new log
-                    cursor.execute("""
-                        INSERT INTO habit_logs (habit_id, date, completed, created_at)
-                        VALUES (?, ?, 1, ?)
-                    """, (habit_id, completion_date, self._get_current_timestamp()))
+                if cursor.rowcount == 0:
+                    # Already completed, statistics are unchanged
+                    return True
 
                 # Update habit statistics
-                self._update_habit_statistics(cursor, habit_id)
+                self._record_completion(cursor, habit_id, day)
 
                 conn.commit()
+                self._habits_changed(cursor, updated=[habit_id])
                 print(f"Habit {habit_id} marked complete for {completion_date}")
                 return True
 
@@ -308,63 +1248,610 @@ class DatabaseManager:
             print(f"Error marking habit complete: {e}")
             raise
 
-    def _update_habit_statistics(self, cursor: sqlite3.Cursor, habit_id: int) -> None:
-        """Update habit statistics (streak, total completed)"""
-        # Calculate total completed
-        cursor.execute("""
-            SELECT COUNT(*) FROM habit_logs
-            WHERE habit_id = ? AND completed = 1
+    def unmark_habit_complete(self, habit_id: int, completion_date: str = None) -> bool:
+        """Undo a habit completion for a specific date"""
+        try:
+            if completion_date is None:
+                completion_date = date.today().isoformat()
+            day = self._parse_day(completion_date)
+            completion_date = day.isoformat()
+
+            conn = self._get_connection()
+            self._attach_archive(conn)
+            with conn:
+                cursor = conn.cursor()
+                self._check_not_archived(cursor, day)
+
+                cursor.execute("""
+                    UPDATE habit_logs SET completed = 0
+                    WHERE habit_id = ? AND date = ? AND completed = 1
+                """, (habit_id, date_to_day_number(day)))
+
+                if cursor.rowcount == 0:
+                    # Nothing was completed on that day
+                    return False
+
+                self._record_uncompletion(cursor, habit_id, day)
+
+                conn.commit()
+                self._habits_changed(cursor, updated=[habit_id])
+                print(f"Habit {habit_id} marked incomplete for {completion_date}")
+                return True
+
+        except sqlite3.Error as e:
+            print(f"Error unmarking habit complete: {e}")
+            raise
+
+    def _parse_day(self, value: str) -> date:
+        """Parse the date part of a stored date or timestamp"""
+        return date.fromisoformat(value[:10])
+
+    def _run_length(self, cursor: sqlite3.Cursor, habit_id: int, start_day: date, step: int) -> int:
+        """Count consecutive completed days from start_day, walking step days at a time"""
+        length = self._walk_run(cursor, "main.habit_logs", habit_id, start_day, step)
+        if step < 0 and self._is_archive_attached(cursor):
+            # A run that stops only because it reached the cutoff goes on in the archive
+            next_day = start_day + timedelta(days=step * length)
+            cutoff = self._get_archive_cutoff(cursor)
+            if cutoff is not None and next_day < cutoff:
+                length += self._walk_run(cursor, "archive.habit_logs", habit_id, next_day, step)
+        return length
+
+    def _walk_run(self, cursor: sqlite3.Cursor, table: str, habit_id: int, start_day: date, step: int) -> int:
+        """Count consecutive completed days of one log table from start_day"""
+        # Walks the (habit_id, date) index one day per probe, so the cost is
+        # proportional to the run that is found, not to the habit's history.
+        start = date_to_day_number(start_day)
+        cursor.execute(f"""
+            WITH RECURSIVE run(day) AS (
+                SELECT ? WHERE EXISTS (
+                    SELECT 1 FROM {table}
+                    WHERE habit_id = ? AND date = ? AND completed = 1
+                )
+                UNION ALL
+                SELECT run.day + ? FROM run
+                WHERE EXISTS (
+                    SELECT 1 FROM {table}
+                    WHERE habit_id = ? AND date = run.day + ? AND completed = 1
+                )
+            )
+            SELECT COUNT(*) FROM run
+        """, (start, habit_id, start, step, habit_id, step))
+        return cursor.fetchone()[0]
+
+    def _longest_run(self, cursor: sqlite3.Cursor, habit_id: int) -> int:
+        """Compute the longest run of completed days for one habit"""
+        cursor.execute(f"""
+            SELECT COALESCE(MAX(run_length), 0) FROM (
+                SELECT COUNT(*) AS run_length FROM (
+                    SELECT date - ROW_NUMBER() OVER (ORDER BY date) AS island
+                    FROM (
+                        SELECT DISTINCT date FROM {self._log_source(cursor)}
+                        WHERE habit_id = ? AND completed = 1
+                    )
+                )
+                GROUP BY island
+            )
         """, (habit_id,))
-        total_completed = cursor.fetchone()[0]
+        return cursor.fetchone()[0]
 
-        # Calculate current streak (simplified)
+    def _load_streak_state(self, cursor: sqlite3.Cursor, habit_id: int) -> Optional[Tuple[Optional[date], int, int]]:
+        """Load last completed day, current streak and longest streak of a habit"""
         cursor.execute("""
-            SELECT COUNT(*) FROM habit_logs
-            WHERE habit_id = ? AND completed = 1
-            ORDER BY date DESC
+            SELECT last_completed_date, streak_count, longest_streak
+            FROM habits WHERE id = ?
         """, (habit_id,))
-        streak_count = cursor.fetchone()[0]
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        last_day = day_number_to_date(row['last_completed_date']) if row['last_completed_date'] is not None else None
+        return last_day, row['streak_count'], row['longest_streak']
 
-        # Update habit
+    def _save_streak_state(self, cursor: sqlite3.Cursor, habit_id: int, last_day: Optional[date],
+                           streak: int, longest: int, completed_delta: int) -> None:
+        """Store streak state and adjust the completion total"""
         cursor.execute("""
             UPDATE habits SET
-                total_completed = ?, streak_count = ?, updated_at = ?
+                total_completed = MAX(total_completed + ?, 0), streak_count = ?,
+                longest_streak = ?, last_completed_date = ?, updated_at = ?
             WHERE id = ?
-        """, (total_completed, streak_count, self._get_current_timestamp(), habit_id))
+        """, (
+            completed_delta, streak, longest,
+            date_to_day_number(last_day) if last_day else None,
+            self._get_current_timestamp(), habit_id
+        ))
+
+    def _record_completion(self, cursor: sqlite3.Cursor, habit_id: int, day: date) -> None:
+        """Fold a newly completed day into the habit statistics"""
+        state = self._load_streak_state(cursor, habit_id)
+        if state is None:
+            return
+        last_day, streak, longest = state
+        one_day = timedelta(days=1)
+
+        if last_day is None or day > last_day:
+            # Extends the current run when it is the next day, otherwise starts a new one
+            streak = streak + 1 if last_day is not None and day == last_day + one_day else 1
+            last_day = day
+            run_length = streak
+        elif day == last_day - timedelta(days=streak):
+            # Back-dated day right before the current run joins it with the run behind it
+            streak += 1 + self._run_length(cursor, habit_id, day - one_day, -1)
+            run_length = streak
+        else:
+            # Older back-dated day can only merge the runs on either side of it
+            run_length = (1 + self._run_length(cursor, habit_id, day - one_day, -1)
+                          + self._run_length(cursor, habit_id, day + one_day, 1))
+
+        self._save_streak_state(cursor, habit_id, last_day, streak, max(longest, run_length), 1)
+
+    def _record_uncompletion(self, cursor: sqlite3.Cursor, habit_id: int, day: date) -> None:
+        """Remove a no longer completed day from the habit statistics"""
+        state = self._load_streak_state(cursor, habit_id)
+        if state is None:
+            return
+        last_day, streak, longest = state
+        one_day = timedelta(days=1)
+
+        if last_day is not None and last_day - timedelta(days=streak - 1) <= day <= last_day:
+            broken_run_length = streak
+            if day < last_day:
+                # The days after the removed one form the new current run
+                streak = (last_day - day).days
+            elif streak > 1:
+                streak -= 1
+                last_day = day - one_day
+            else:
+                # The current run is gone, fall back to the previous completion
+                cursor.execute(f"""
+                    SELECT MAX(date) FROM {self._log_source(cursor)}
+                    WHERE habit_id = ? AND completed = 1 AND date < ?
+                """, (habit_id, date_to_day_number(day)))
+                previous = cursor.fetchone()[0]
+                last_day = day_number_to_date(previous) if previous is not None else None
+                streak = self._run_length(cursor, habit_id, last_day, -1) if last_day else 0
+        else:
+            broken_run_length = (1 + self._run_length(cursor, habit_id, day - one_day, -1)
+                                 + self._run_length(cursor, habit_id, day + one_day, 1))
+
+        if broken_run_length >= longest:
+            # Only splitting the longest run can lower it; rare enough to recount
+            longest = self._longest_run(cursor, habit_id)
+
+        self._save_streak_state(cursor, habit_id, last_day, streak, longest, -1)
+
+    def rebuild_statistics(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """Recompute streak, longest streak and total completed for every habit"""
+        try:
+            conn = self._get_connection()
+            self._attach_archive(conn)
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                summary = self._rebuild_statistics(cursor, progress_callback=progress_callback)
 
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get application statistics"""
+            # Every habit may have changed, listeners should reload
+            self._habit_cache.clear()
+            self._publish_change(reload=True)
+            print(f"Rebuilt statistics for {summary['habits_updated']} habits")
+            return summary
+
+        except sqlite3.Error as e:
+            print(f"Error rebuilding statistics: {e}")
+            raise
+
+    def _rebuild_statistics(self, cursor: sqlite3.Cursor, habit_ids: Optional[List[int]] = None,
+                            progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """Set-based gaps-and-islands recompute of habit statistics, optionally for some habits only"""
+        total_steps = 4
+
+        def report(step: int, message: str) -> None:
+            if progress_callback:
+                progress_callback(step, total_steps, message)
+
+        log_filter = habit_filter = ""
+        cursor.execute("DROP TABLE IF EXISTS temp.rebuild_targets")
+        if habit_ids is not None:
+            cursor.execute("CREATE TEMP TABLE rebuild_targets (id INTEGER PRIMARY KEY)")
+            cursor.executemany("INSERT OR IGNORE INTO temp.rebuild_targets (id) VALUES (?)",
+                               [(habit_id,) for habit_id in habit_ids])
+            log_filter = "AND habit_id IN (SELECT id FROM temp.rebuild_targets)"
+            habit_filter = "AND id IN (SELECT id FROM temp.rebuild_targets)"
+
+        # Numbering every (habit, day) pair in index order makes (day - row
+        # number) constant within a run of consecutive days, so each distinct
+        # value per habit is one island
+        report(1, "Collecting completion runs")
+        source = self._log_source(cursor)
+        cursor.execute("DROP TABLE IF EXISTS temp.habit_runs")
+        cursor.execute(f"""
+            CREATE TEMP TABLE habit_runs AS
+            SELECT habit_id, COUNT(*) AS run_length, MAX(date) AS run_end
+            FROM (
+                SELECT habit_id, date,
+                    date - ROW_NUMBER() OVER (ORDER BY habit_id, date) AS island
+                FROM {source}
+                WHERE completed = 1 {log_filter}
+            )
+            GROUP BY habit_id, island
+        """)
+        cursor.execute("CREATE INDEX temp.idx_habit_runs_end ON habit_runs(habit_id, run_end)")
+
+        report(2, "Aggregating runs per habit")
+        cursor.execute("DROP TABLE IF EXISTS temp.habit_run_totals")
+        cursor.execute("""
+            CREATE TEMP TABLE habit_run_totals AS
+            SELECT habit_id, SUM(run_length) AS total, MAX(run_length) AS longest,
+                MAX(run_end) AS last_completed
+            FROM habit_runs
+            GROUP BY habit_id
+        """)
+
+        report(3, "Updating habit statistics")
+        cursor.execute("""
+            UPDATE habits SET
+                total_completed = totals.total,
+                longest_streak = totals.longest,
+                last_completed_date = totals.last_completed,
+                streak_count = (
+                    SELECT runs.run_length FROM habit_runs AS runs
+                    WHERE runs.habit_id = totals.habit_id AND runs.run_end = totals.last_completed
+                )
+            FROM habit_run_totals AS totals
+            WHERE habits.id = totals.habit_id
+        """)
+        habits_updated = cursor.rowcount
+
+        report(4, "Resetting habits without completions")
+        cursor.execute(f"""
+            UPDATE habits SET
+                total_completed = 0, longest_streak = 0,
+                last_completed_date = NULL, streak_count = 0
+            WHERE id NOT IN (SELECT habit_id FROM habit_run_totals) {habit_filter}
+        """)
+        habits_updated += cursor.rowcount
+
+        cursor.execute("SELECT COUNT(*) FROM habit_runs")
+        runs = cursor.fetchone()[0]
+
+        for table in ("habit_run_totals", "habit_runs", "rebuild_targets"):
+            cursor.execute(f"DROP TABLE IF EXISTS temp.{table}")
+
+        return {'habits_updated': habits_updated, 'runs': runs}
+
+    def rebuild_rollups(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """Recompute the weekly and monthly rollups from habit_logs"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._get_connection()
+            self._attach_archive(conn)
+            with conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                if progress_callback:
+                    progress_callback(1, 2, "Clearing rollups")
+                cursor.execute("DELETE FROM habit_rollups")
+
+                if progress_callback:
+                    progress_callback(2, 2, "Aggregating habit logs")
+                rows = self._fill_rollups(cursor)
+
+            print(f"Rebuilt {rows} rollup rows")
+            return {'rows': rows}
 
-                # Total habits
-                cursor.execute("SELECT COUNT(*) FROM habits")
-                total_habits = cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error rebuilding rollups: {e}")
+            raise
+
+    def _period_start(self, day: date, granularity: str) -> date:
+        """First day of the week or month containing day"""
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        return day.replace(day=1)
+
+    def _period_days(self, period: date, granularity: str) -> int:
+        """Number of days in the week or month starting at period"""
+        if granularity == 'week':
+            return 7
+        return calendar.monthrange(period.year, period.month)[1]
 
-                # Completed habits
-                cursor.execute("SELECT COUNT(*) FROM habits WHERE status = 'Selesai'")
-                completed_habits = cursor.fetchone()[0]
+    def get_completion_series(self, habit_id: int, granularity: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Completions of a habit per week or month between two dates, one entry per period
 
-                # Pending habits
-                cursor.execute("SELECT COUNT(*) FROM habits WHERE status = 'Belum'")
-                pending_habits = cursor.fetchone()[0]
+        Periods without logs are included with zero counts.
+        """
+        if granularity not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        first = self._period_start(self._parse_day(start), granularity)
+        last = self._period_start(self._parse_day(end), granularity)
+
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
 
-                # Category breakdown
                 cursor.execute("""
-                    SELECT category, COUNT(*) as count
-                    FROM habits
-                    GROUP BY category
-                """)
-                category_breakdown = dict(cursor.fetchall())
+                    SELECT period, logged_days, completed_days FROM habit_rollups
+                    WHERE habit_id = ? AND granularity = ? AND period BETWEEN ? AND ?
+                """, (habit_id, granularity, date_to_day_number(first), date_to_day_number(last)))
+                counts = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
 
-                # Priority breakdown
+        except sqlite3.Error as e:
+            print(f"Error getting completion series: {e}")
+            raise
+
+        series = []
+        period = first
+        while period <= last:
+            days = self._period_days(period, granularity)
+            logged, completed = counts.get(date_to_day_number(period), (0, 0))
+            series.append({
+                'period': period.isoformat(),
+                'days': days,
+                'logged_days': logged,
+                'completed_days': completed,
+                'completion_rate': completed / days * 100
+            })
+            period += timedelta(days=days)
+        return series
+
+    def archive_logs(self, before: Optional[str] = None, batch_size: int = ARCHIVE_BATCH_SIZE,
+                     progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """Move habit logs dated before a cutoff into the archive database
+
+        The cutoff defaults to ARCHIVE_AFTER_DAYS ago and never moves back.
+        Logs move in batches of batch_size, one transaction each, so the
+        application keeps writing in between. Rollups and habit statistics
+        keep counting archived logs.
+        """
+        cutoff = self._parse_day(before) if before else date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+        try:
+            conn = self._get_connection()
+            self._attach_archive(conn, create=True)
+            cursor = conn.cursor()
+
+            previous = self._get_archive_cutoff(cursor)
+            if previous is not None and previous > cutoff:
+                cutoff = previous
+            with conn:
+                # Recorded first: from now on the rollup triggers ignore deleted
+                # logs older than the cutoff and such days can't be written
                 cursor.execute("""
-                    SELECT priority, COUNT(*) as count
-                    FROM habits
-                    GROUP BY priority
+                    INSERT INTO app_meta (key, value) VALUES ('archive_cutoff', ?)
+                    ON CONFLICT (key) DO UPDATE SET value = excluded.value
+                """, (str(date_to_day_number(cutoff)),))
+
+            cursor.execute("SELECT COUNT(*) FROM habit_logs WHERE date < ?", (date_to_day_number(cutoff),))
+            total = cursor.fetchone()[0]
+
+            moved = 0
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+            while moved < total:
+                with conn:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute("DELETE FROM temp.archive_batch")
+                    cursor.execute("""
+                        INSERT INTO temp.archive_batch (id)
+                        SELECT id FROM habit_logs WHERE date < ? ORDER BY date LIMIT ?
+                    """, (date_to_day_number(cutoff), batch_size))
+                    if cursor.rowcount == 0:
+                        break
+
+                    # OR IGNORE makes a batch interrupted between the two
+                    # databases safe to run again
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO archive.habit_logs
+                        SELECT * FROM main.habit_logs WHERE id IN (SELECT id FROM temp.archive_batch)
+                    """)
+                    cursor.execute("DELETE FROM main.habit_logs WHERE id IN (SELECT id FROM temp.archive_batch)")
+                    moved += cursor.rowcount
+
+                if progress_callback:
+                    progress_callback(moved, total, f"Archived {moved} of {total} logs")
+
+            with conn:
+                # Logs of deleted habits are no longer reachable
+                cursor.execute("""
+                    DELETE FROM archive.habit_logs
+                    WHERE habit_id NOT IN (SELECT id FROM main.habits)
                 """)
-                priority_breakdown = dict(cursor.fetchall())
+                purged = cursor.rowcount
+            cursor.execute("DROP TABLE IF EXISTS temp.archive_batch")
+
+            print(f"Archived {moved} habit logs dated before {cutoff.isoformat()}")
+            return {'archived': moved, 'purged': purged, 'cutoff': cutoff.isoformat()}
+
+        except sqlite3.Error as e:
+            print(f"Error archiving habit logs: {e}")
+            raise
+
+    def vacuum(self) -> None:
+        """Rewrite the main database file so pages freed by archiving are returned"""
+        try:
+            self._get_connection().execute("VACUUM main")
+        except sqlite3.Error as e:
+            print(f"Error vacuuming database: {e}")
+            raise
+
+    def _backup_dir(self) -> Path:
+        """Folder the backups of this database are written to"""
+        return Path(self.db_path).parent / "backups"
+
+    def _copy_pages(self, source: sqlite3.Connection, target: sqlite3.Connection, pages: int,
+                    progress_callback: Optional[Callable[[int, int, str], None]]) -> None:
+        """Run the online backup API from source to target in steps of pages"""
+        def report(status: int, remaining: int, total: int) -> None:
+            if progress_callback:
+                progress_callback(total - remaining, total, f"Copied {total - remaining} of {total} pages")
+
+        source.backup(target, pages=pages, progress=report)
+
+    def backup(self, dest_path: Optional[str] = None, pages: int = BACKUP_PAGES_PER_STEP,
+               progress_callback: Optional[Callable[[int, int, str], None]] = None,
+               prefix: Optional[str] = None) -> str:
+        """Copy the live database to a backup file and return its path
+
+        The copy is read from one snapshot held for the whole backup, so
+        writers keep committing (WAL) without restarting it, and is written
+        to a .part file that only replaces dest_path once complete. The
+        default destination is backups/<prefix>_<timestamp>.db next to the
+        database, prefix defaulting to the database name.
+        """
+        if dest_path is None:
+            dest_path = str(self._backup_dir() / create_backup_filename(prefix or Path(self.db_path).stem))
+        partial_path = Path(f"{dest_path}.part")
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path.unlink(missing_ok=True)
+
+        try:
+            source = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            target = sqlite3.connect(str(partial_path))
+            try:
+                # Any commit by another connection would restart the copy
+                # from page one, pin the snapshot with a read transaction
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                self._copy_pages(source, target, pages, progress_callback)
+                source.execute("COMMIT")
+                # The copied header says WAL, keep the backup a single file
+                target.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                target.close()
+                source.close()
+
+            partial_path.replace(dest_path)
+            print(f"Backed up database to {dest_path}")
+            return dest_path
+
+        except sqlite3.Error as e:
+            partial_path.unlink(missing_ok=True)
+            print(f"Error backing up database: {e}")
+            raise
+
+    def list_backups(self) -> List[str]:
+        """Paths of the timestamped backups of this database, newest first"""
+        pattern = f"{Path(self.db_path).stem}_{'[0-9]' * 8}_{'[0-9]' * 6}.db"
+        return sorted((str(path) for path in self._backup_dir().glob(pattern)), reverse=True)
+
+    def rotate_backups(self, keep: int = BACKUP_KEEP) -> List[str]:
+        """Delete all but the newest keep backups and return the deleted paths"""
+        removed = self.list_backups()[max(keep, 0):]
+        for path in removed:
+            Path(path).unlink(missing_ok=True)
+        if removed:
+            print(f"Removed {len(removed)} old backups")
+        return removed
+
+    def restore(self, backup_path: str, pages: int = BACKUP_PAGES_PER_STEP,
+                progress_callback: Optional[Callable[[int, int, str], None]] = None) -> str:
+        """Replace the database contents with a backup
+
+        The current contents are saved first as a <name>_pre_restore backup,
+        which rotation leaves alone, and its path is returned. Backups of
+        older schema versions are migrated and listeners are told to reload.
+        """
+        if not Path(backup_path).is_file():
+            raise ValueError(f"Backup not found: {backup_path}")
+
+        try:
+            source = sqlite3.connect(f"{Path(backup_path).resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                cursor = source.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'habits'")
+                if cursor.fetchone() is None:
+                    raise ValueError(f"Not a {Path(self.db_path).stem} backup: {backup_path}")
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] > SCHEMA_VERSION:
+                    raise ValueError(f"Backup is from a newer version of the application: {backup_path}")
+                cursor.execute("PRAGMA quick_check")
+                if cursor.fetchone()[0] != 'ok':
+                    raise ValueError(f"Backup is corrupt: {backup_path}")
+
+                safety_path = self.backup(prefix=f"{Path(self.db_path).stem}_pre_restore")
+
+                target = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+                try:
+                    self._copy_pages(source, target, pages, progress_callback)
+                finally:
+                    target.close()
+            finally:
+                source.close()
+
+            # Everything may have changed, including the schema version
+            self._habit_cache.clear()
+            self._category_cache.clear()
+            self._create_tables()
+            self._publish_change(reload=True)
+            print(f"Restored database from {backup_path}")
+            return safety_path
+
+        except sqlite3.Error as e:
+            print(f"Error restoring database: {e}")
+            raise
+
+    def get_habit_logs(self, habit_id: int, start: Optional[str] = None,
+                       end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the logs of a habit between two dates, oldest first
+
+        The archive is attached only when start reaches back before its cutoff.
+        """
+        try:
+            conn = self._get_connection()
+            archived = self._attach_archive(conn, since=self._parse_day(start) if start else None)
+            with conn:
+                cursor = conn.cursor()
+
+                conditions, bounds = "habit_id = ?", [habit_id]
+                if start:
+                    conditions += " AND date >= ?"
+                    bounds.append(date_to_day_number(start))
+                if end:
+                    conditions += " AND date <= ?"
+                    bounds.append(date_to_day_number(end))
+
+                tables = ["main.habit_logs"] + (["archive.habit_logs"] if archived else [])
+                query = " UNION ALL ".join(
+                    f"SELECT date, completed, notes, created_at FROM {table} WHERE {conditions}"
+                    for table in tables
+                )
+                cursor.execute(query + " ORDER BY date", bounds * len(tables))
+
+                logs = []
+                for row in cursor.fetchall():
+                    log = dict(row)
+                    log['date'] = format_day_number(log['date'])
+                    log['created_at'] = format_epoch(log['created_at'])
+                    logs.append(log)
+                return logs
+
+        except sqlite3.Error as e:
+            print(f"Error getting habit logs: {e}")
+            raise
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get application statistics"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+
+                # All counters come from the trigger-maintained summary table
+                cursor.execute("SELECT dimension, value, habit_count FROM habit_stats")
+
+                breakdowns = {'status': {}, 'category': {}, 'priority': {}}
+                for dimension, value, count in cursor.fetchall():
+                    breakdowns[dimension][value] = count
+
+                status_breakdown = breakdowns['status']
+                total_habits = sum(status_breakdown.values())
+                completed_habits = status_breakdown.get('Selesai', 0)
+                pending_habits = status_breakdown.get('Belum', 0)
+                category_breakdown = {}
+                for category_id, count in breakdowns['category'].items():
+                    category = self._get_category(int(category_id))
+                    category_breakdown[category['name'] if category else category_id] = count
+                priority_breakdown = breakdowns['priority']
 
                 return {
                     'total_habits': total_habits,
@@ -381,19 +1868,95 @@ class DatabaseManager:
 
     def get_categories(self) -> List[Dict[str, Any]]:
         """Get all categories"""
+        return [dict(category) for category in self.get_category_map().values()]
+
+    def get_category_map(self) -> Dict[int, Dict[str, Any]]:
+        """Get all categories keyed by id, ordered by name"""
+        cached = self._category_cache.get('map')
+        if cached is not None:
+            return {category_id: dict(category) for category_id, category in cached.items()}
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            token = self._category_cache.token()
+            # Plain cursor: this also runs inside write transactions resolving names
+            cursor = self._get_connection().cursor()
+            cursor.execute("SELECT * FROM categories ORDER BY name")
+            category_map = {row['id']: dict(row) for row in cursor.fetchall()}
+
+            self._category_cache.put('map', category_map, token)
+            return {category_id: dict(category) for category_id, category in category_map.items()}
+
+        except sqlite3.Error as e:
+            print(f"Error getting categories: {e}")
+            raise
+
+    def _get_category(self, category_id: int) -> Optional[Dict[str, Any]]:
+        """Cached category row for an id, reloading once for ids added elsewhere"""
+        category_map = self._category_cache.get('map') or self.get_category_map()
+        if category_id not in category_map:
+            self._category_cache.clear()
+            category_map = self.get_category_map()
+        return category_map.get(category_id)
+
+    def get_category_id(self, name: str) -> Optional[int]:
+        """Get the id of a category by name"""
+        category_map = self._category_cache.get('map') or self.get_category_map()
+        for category_id, category in category_map.items():
+            if category['name'] == name:
+                return category_id
+        return None
+
+    def _require_category_id(self, name: str) -> int:
+        """Id of a category habits are written with, ValueError if it does not exist"""
+        category_id = self.get_category_id(name)
+        if category_id is None:
+            # Categories may have been added by another connection since the map was cached
+            self._category_cache.clear()
+            category_id = self.get_category_id(name)
+        if category_id is None:
+            raise ValueError(f"Unknown category: {name}")
+        return category_id
+
+    def add_category(self, name: str, color: str, icon: Optional[str] = None) -> int:
+        """Create a new category"""
+        try:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute("SELECT * FROM categories ORDER BY name")
-                rows = cursor.fetchall()
+                cursor.execute("""
+                    INSERT INTO categories (name, color, icon)
+                    VALUES (?, ?, ?)
+                """, (name, color, icon))
 
-                return [dict(row) for row in rows]
+                category_id = cursor.lastrowid
+                conn.commit()
+                self._category_cache.clear()
+                print(f"Category created with ID: {category_id}")
+                return category_id
 
+        except sqlite3.IntegrityError as e:
+            print(f"Integrity error creating category: {e}")
+            raise ValueError("Category name already exists")
         except sqlite3.Error as e:
-            print(f"Error getting categories: {e}")
+            print(f"Error creating category: {e}")
             raise
 
-# Global database instance
-db_manager = DatabaseManager()
+# Shared database instance, created on first use so importing this module
+# does not open the database
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
+
+def get_db_manager() -> DatabaseManager:
+    """Get the shared DatabaseManager, creating it on first use"""
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
+    return _db_manager
+
+def __getattr__(name: str) -> Any:
+    """Keep the old module-level db_manager attribute working lazily"""
+    if name == 'db_manager':
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
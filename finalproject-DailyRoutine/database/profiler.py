@@ -0,0 +1,393 @@
+"""
+Opt-in query profiler for DailyRoutine database access
+
+Enabled by DB_PROFILE in config.constants or the DAILYROUTINE_PROFILE
+environment variable. When it is off DatabaseManager opens plain sqlite3
+connections and none of this module runs.
+"""
+
+import bisect
+import functools
+import inspect
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from config.constants import DB_PROFILE, DB_SLOW_QUERY_MS
+
+PROFILE_ENV = "DAILYROUTINE_PROFILE"
+SLOW_QUERY_MS_ENV = "DAILYROUTINE_SLOW_QUERY_MS"
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket is open
+HISTOGRAM_BOUNDS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+# Statements EXPLAIN QUERY PLAN can say something useful about
+_PLANNABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+# Table references with an optional alias, plan lines name a table by its alias
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+([\w.]+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, total and max"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        """Add one sample"""
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return HISTOGRAM_BOUNDS_MS[index] if index < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters and bucket percentiles"""
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': dict(zip([f"<={bound}" for bound in HISTOGRAM_BOUNDS_MS] + ["inf"], self.buckets)),
+        }
+
+
+class QueryProfiler:
+    """Collects statement and operation latencies, query plans and slow queries"""
+
+    def __init__(self, slow_query_ms: float = DB_SLOW_QUERY_MS, log_path: Optional[str] = None):
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.operations: Dict[str, LatencyHistogram] = {}
+        self.statements: Dict[str, LatencyHistogram] = {}
+        self.plans: Dict[str, List[str]] = {}
+        self.full_scans: Dict[str, List[str]] = {}
+        # Statements run by each operation, including those of nested operations
+        self.operation_statements: Dict[str, int] = {}
+        self.slow_queries = 0
+
+    @classmethod
+    def from_environment(cls, log_path: Optional[str] = None) -> Optional['QueryProfiler']:
+        """A profiler when profiling is switched on by setting or environment, None otherwise"""
+        flag = os.environ.get(PROFILE_ENV)
+        enabled = DB_PROFILE if flag is None else flag.strip().lower() in ("1", "true", "yes", "on")
+        if not enabled:
+            return None
+
+        threshold = os.environ.get(SLOW_QUERY_MS_ENV)
+        return cls(slow_query_ms=float(threshold) if threshold else DB_SLOW_QUERY_MS, log_path=log_path)
+
+    def connect(self, db_path: str, **kwargs) -> sqlite3.Connection:
+        """Open a connection whose statements are timed by this profiler"""
+        conn = sqlite3.connect(db_path, factory=ProfilingConnection, **kwargs)
+        conn.profiler = self
+        return conn
+
+    def wrap_operation(self, name: str, func: Callable) -> Callable:
+        """Time func as the logical operation name, tagging the statements it runs"""
+        if inspect.isgeneratorfunction(func):
+            return self._wrap_generator(name, func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._operation_stack()
+            stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                stack.pop()
+                self._record_operation(name, elapsed_ms)
+        return wrapper
+
+    def _wrap_generator(self, name: str, func: Callable) -> Callable:
+        """Time a generator function from its call until it is exhausted or closed
+
+        The operation is on the stack whenever the generator runs, so the
+        statements of every page it fetches are tagged with it, but not
+        while the consumer handles a row.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    stack = self._operation_stack()
+                    stack.append(name)
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        stack.pop()
+                    yield item
+            finally:
+                generator.close()
+                self._record_operation(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    def _record_operation(self, name: str, elapsed_ms: float) -> None:
+        """Add one finished call of operation name"""
+        with self._lock:
+            self.operations.setdefault(name, LatencyHistogram()).record(elapsed_ms)
+
+    def _operation_stack(self) -> List[str]:
+        """Operations running on the calling thread, innermost last"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_operation(self) -> str:
+        """Innermost operation of the calling thread"""
+        stack = self._operation_stack()
+        return stack[-1] if stack else "(unscoped)"
+
+    def record_statement(self, conn: sqlite3.Connection, sql: str, params: Any, elapsed_ms: float) -> None:
+        """Account one statement, looking at its plan the first time it is seen"""
+        key = _WHITESPACE.sub(" ", sql).strip()
+        operation = self.current_operation()
+        with self._lock:
+            self.statements.setdefault(key, LatencyHistogram()).record(elapsed_ms)
+            # Counted for every enclosing operation, so nested calls add up
+            for name in set(self._operation_stack()):
+                self.operation_statements[name] = self.operation_statements.get(name, 0) + 1
+            plan = self.plans.get(key)
+
+        if plan is None:
+            plan = self._explain(conn, sql, params)
+            tables = self._table_names(conn, sql) if plan else set()
+            with self._lock:
+                self.plans[key] = plan
+                scans = [line for line in plan if _is_full_scan(line, tables)]
+                if scans:
+                    self.full_scans[key] = scans
+
+        if elapsed_ms >= self.slow_query_ms:
+            with self._lock:
+                self.slow_queries += 1
+            self._log_slow_query(operation, key, params, elapsed_ms, plan)
+
+    def _explain(self, conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+        """EXPLAIN QUERY PLAN detail lines, empty when the statement has no plan"""
+        if not _PLANNABLE.match(sql):
+            return []
+        try:
+            # A plain cursor, so the EXPLAIN itself is not profiled
+            cursor = sqlite3.Cursor(conn)
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [row[3] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            return [f"(plan unavailable: {e})"]
+
+    def _table_names(self, conn: sqlite3.Connection, sql: str) -> Set[str]:
+        """Names plan lines of sql can give real tables by: table, schema.table or alias"""
+        tables = set()
+        try:
+            cursor = sqlite3.Cursor(conn)
+            # Temp tables are scratch work tables built to be read in full
+            schemas = [row[1] for row in cursor.execute("PRAGMA database_list").fetchall() if row[1] != "temp"]
+            for schema in schemas:
+                cursor.execute(f'SELECT name FROM "{schema}".sqlite_schema WHERE type = \'table\'')
+                for (name,) in cursor.fetchall():
+                    if name.startswith("sqlite_"):
+                        continue
+                    tables.add(name)
+                    tables.add(f"{schema}.{name}")
+        except sqlite3.Error:
+            return tables
+
+        # CTEs and subqueries are not in the schema, neither are their aliases
+        tables.update(alias for table, alias in _TABLE_REFERENCE.findall(sql) if alias and table in tables)
+        return tables
+
+    def _log_slow_query(self, operation: str, sql: str, params: Any, elapsed_ms: float, plan: List[str]) -> None:
+        """Append a slow statement with its plan to the slow-query log"""
+        if not self.log_path:
+            return
+        lines = [
+            f"{datetime.now().isoformat(timespec='milliseconds')} {elapsed_ms:.1f} ms in {operation}"
+            + (" [FULL SCAN]" if sql in self.full_scans else ""),
+            f"  sql: {sql}",
+            f"  params: {_shorten(repr(params))}",
+        ] + [f"  plan: {line}" for line in plan]
+        try:
+            with self._lock, open(self.log_path, "a", encoding="utf-8") as log:
+                log.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        """Histograms per operation and per statement, slowest first, with flagged scans"""
+        with self._lock:
+            by_total = lambda item: -item[1].total_ms
+            return {
+                'slow_query_ms': self.slow_query_ms,
+                'slow_queries': self.slow_queries,
+                'operations': {name: dict(histogram.summary(), statements=self.operation_statements.get(name, 0))
+                               for name, histogram in sorted(self.operations.items(), key=by_total)},
+                'statements': {sql: histogram.summary()
+                               for sql, histogram in sorted(self.statements.items(), key=by_total)},
+                'full_scans': dict(self.full_scans),
+            }
+
+    def format_report(self, top: int = 10) -> str:
+        """Human readable summary of report()"""
+        report = self.report()
+        lines = [f"{'operation':<32} {'calls':>7} {'stmts':>7} {'total ms':>10} {'p50':>7} {'p95':>7} "
+                 f"{'p99':>7} {'max':>8}"]
+        for name, stats in list(report['operations'].items())[:top]:
+            lines.append(f"{name:<32} {stats['count']:>7} {stats['statements']:>7} {stats['total_ms']:>10.1f} "
+                         f"{stats['p50_ms']:>7} {stats['p95_ms']:>7} {stats['p99_ms']:>7} {stats['max_ms']:>8.1f}")
+        lines.append(f"{report['slow_queries']} statements took {report['slow_query_ms']} ms or more"
+                     + (f", logged to {self.log_path}" if self.log_path else ""))
+        for sql, scans in report['full_scans'].items():
+            lines.append(f"Full scan ({'; '.join(scans)}): {_shorten(sql)}")
+        return "\n".join(lines)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor timing each statement from execute through its last fetch"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._statement = None
+
+    def _start(self, sql: str, params: Any, run: Callable) -> 'ProfilingCursor':
+        """Run a statement, keeping it open so fetch time is added before it is recorded"""
+        self._finish()
+        start = time.perf_counter()
+        try:
+            run()
+        finally:
+            self._statement = [sql, params, (time.perf_counter() - start) * 1000]
+        return self
+
+    def _timed_fetch(self, fetch: Callable, done: Callable[[Any], bool]) -> Any:
+        """Run a fetch, adding its time to the open statement"""
+        start = time.perf_counter()
+        try:
+            result = fetch()
+        finally:
+            if self._statement is not None:
+                self._statement[2] += (time.perf_counter() - start) * 1000
+        if done(result):
+            self._finish()
+        return result
+
+    def _finish(self) -> None:
+        """Record the open statement, if any"""
+        if self._statement is not None:
+            sql, params, elapsed_ms = self._statement
+            self._statement = None
+            self.connection.profiler.record_statement(self.connection, sql, params, elapsed_ms)
+
+    def execute(self, sql: str, parameters: Any = ()) -> 'ProfilingCursor':
+        return self._start(sql, parameters, lambda: super(ProfilingCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> 'ProfilingCursor':
+        # Materialize so the first row can be reused for EXPLAIN
+        rows = seq_of_parameters if isinstance(seq_of_parameters, Sequence) else list(seq_of_parameters)
+        first = rows[0] if rows else ()
+        return self._start(sql, first, lambda: super(ProfilingCursor, self).executemany(sql, rows))
+
+    def executescript(self, sql_script: str) -> 'ProfilingCursor':
+        return self._start(sql_script, (), lambda: super(ProfilingCursor, self).executescript(sql_script))
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone, lambda row: row is None)
+
+    def fetchmany(self, size: int = None):
+        fetch = super().fetchmany if size is None else functools.partial(super().fetchmany, size)
+        return self._timed_fetch(fetch, lambda rows: not rows)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall, lambda rows: True)
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return super().__next__()
+        except StopIteration:
+            self._finish()
+            raise
+        finally:
+            if self._statement is not None:
+                self._statement[2] += (time.perf_counter() - start) * 1000
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """Connection whose cursors, shortcut executes and commits are timed"""
+
+    profiler: QueryProfiler
+
+    def cursor(self, factory: type = ProfilingCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            self.profiler.record_statement(self, "COMMIT", (), (time.perf_counter() - start) * 1000)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        start = time.perf_counter()
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            sql = "COMMIT" if exc_type is None else "ROLLBACK"
+            self.profiler.record_statement(self, sql, (), (time.perf_counter() - start) * 1000)
+
+
+def _is_full_scan(plan_line: str, tables: Set[str]) -> bool:
+    """Whether a plan line reads a whole table rather than seeking an index
+
+    tables holds the names of real tables; CTE work tables, materialized
+    subqueries, constant rows and schema lookups are not worth indexing.
+    """
+    if not plan_line.startswith("SCAN ") or " USING " in plan_line or "VIRTUAL TABLE" in plan_line:
+        return False
+    if plan_line.startswith("SCAN CONSTANT ROW"):
+        return False
+    return plan_line[len("SCAN "):].split(" ")[0] in tables
+
+def _shorten(text: str, limit: int = 200) -> str:
+    """Clip long SQL or parameter lists for log lines"""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
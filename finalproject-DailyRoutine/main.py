@@ -5,7 +5,12 @@ Main entry point
 """
 
 import sys
+import time
 import logging
+
+# Taken before the heavy imports so the startup log covers them
+_process_start = time.perf_counter()
+
 from PyQt5.QtWidgets import QApplication
 
 from config.constants import APP_NAME, APP_VERSION
@@ -27,7 +32,8 @@ def main():
     try:
         main_win = MainWindow()
         main_win.show()
-        logging.info("Application started successfully.")
+        elapsed_ms = (time.perf_counter() - _process_start) * 1000
+        logging.info(f"Application started successfully in {elapsed_ms:.0f} ms.")
         sys.exit(app.exec_())
     except Exception as e:
         logging.error(f"Application failed to start: {e}", exc_info=True)
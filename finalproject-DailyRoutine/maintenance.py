@@ -0,0 +1,88 @@
+"""
+Database maintenance commands for DailyRoutine application
+
+Rebuilds the derived tables (habit statistics and completion rollups)
+from habit_logs, e.g. after importing logs with triggers bypassed, moves
+old logs to the archive database and makes or restores online backups.
+"""
+
+import argparse
+
+from config.constants import DATABASE_PATH, ARCHIVE_BATCH_SIZE, BACKUP_KEEP, BACKUP_PAGES_PER_STEP
+from database.database import DatabaseManager
+
+def print_progress(step: int, total: int, message: str) -> None:
+    """Progress callback printing one line per step"""
+    print(f"[{step}/{total}] {message}")
+
+def rebuild_statistics(db: DatabaseManager, args: argparse.Namespace) -> None:
+    """Recompute streaks and completion totals"""
+    summary = db.rebuild_statistics(progress_callback=print_progress)
+    print(f"Updated {summary['habits_updated']} habits from {summary['runs']} runs")
+
+def rebuild_rollups(db: DatabaseManager, args: argparse.Namespace) -> None:
+    """Recompute the weekly and monthly completion rollups"""
+    summary = db.rebuild_rollups(progress_callback=print_progress)
+    print(f"Wrote {summary['rows']} rollup rows")
+
+def archive_logs(db: DatabaseManager, args: argparse.Namespace) -> None:
+    """Move old habit logs to the archive database"""
+    summary = db.archive_logs(before=args.before, batch_size=args.batch_size,
+                              progress_callback=print_progress)
+    print(f"Moved {summary['archived']} logs before {summary['cutoff']} to {db.archive_path}, "
+          f"purged {summary['purged']} logs of deleted habits")
+
+    if args.vacuum:
+        # Deleted pages only go back to the file system after a VACUUM
+        db.vacuum()
+        print(f"Vacuumed {db.db_path}")
+
+def backup_database(db: DatabaseManager, args: argparse.Namespace) -> None:
+    """Copy the live database to a backup and rotate old backups"""
+    path = db.backup(dest_path=args.output, pages=args.pages, progress_callback=print_progress)
+    if args.output is None:
+        db.rotate_backups(args.keep)
+    print(f"Backup written to {path}")
+
+def restore_database(db: DatabaseManager, args: argparse.Namespace) -> None:
+    """Replace the database contents with a backup"""
+    safety_path = db.restore(args.backup, pages=args.pages, progress_callback=print_progress)
+    print(f"Restored {db.db_path} from {args.backup}, previous contents saved to {safety_path}")
+
+def main():
+    """Run a maintenance command"""
+    parser = argparse.ArgumentParser(description="DailyRoutine database maintenance")
+    parser.add_argument("--db", default=DATABASE_PATH, help="database file to maintain")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-statistics", help="recompute streaks and totals").set_defaults(
+        handler=rebuild_statistics)
+    commands.add_parser("rebuild-rollups", help="recompute weekly/monthly rollups").set_defaults(
+        handler=rebuild_rollups)
+
+    archive = commands.add_parser("archive", help="move old habit logs to the archive database")
+    archive.add_argument("--before", help="archive logs dated before this day (YYYY-MM-DD)")
+    archive.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="logs moved per transaction")
+    archive.add_argument("--vacuum", action="store_true", help="shrink the main database afterwards")
+    archive.set_defaults(handler=archive_logs)
+
+    backup = commands.add_parser("backup", help="copy the live database to a backup file")
+    backup.add_argument("--output", help="backup file to write, default a timestamped file in backups/")
+    backup.add_argument("--keep", type=int, default=BACKUP_KEEP, help="timestamped backups kept by rotation")
+    backup.add_argument("--pages", type=int, default=BACKUP_PAGES_PER_STEP, help="pages copied per step")
+    backup.set_defaults(handler=backup_database)
+
+    restore = commands.add_parser("restore", help="replace the database with a backup")
+    restore.add_argument("backup", help="backup file to restore")
+    restore.add_argument("--pages", type=int, default=BACKUP_PAGES_PER_STEP, help="pages copied per step")
+    restore.set_defaults(handler=restore_database)
+
+    args = parser.parse_args()
+    db = DatabaseManager(args.db)
+    try:
+        args.handler(db, args)
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
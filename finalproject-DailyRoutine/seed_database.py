@@ -1,76 +1,190 @@
-import sqlite3
+"""
+Synthetic data generator for DailyRoutine application
+
+Fills the database with habits and their daily logs. The same --seed,
+--habits, --days and --end-date always produce the same dataset, so
+performance changes can be measured against identical data, e.g.
+
+    python seed_database.py --habits 100000 --days 730 --completion-rate 0.6 --seed 42
+"""
+
+import argparse
+import itertools
 import random
-from datetime import date, timedelta
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
 
 # Import the database manager to ensure tables are created
 from database.database import DatabaseManager
+from utils.helpers import date_to_day_number, day_number_to_date, datetime_to_epoch
+from config.constants import DATABASE_PATH, HABIT_CATEGORIES, HABIT_PRIORITIES, COLORS
 
-# Path to the database file, relative to the project root
-DB_PATH = './database/habits.db'
-
-# Pre-defined sample data
+# Pre-defined sample data, numbered once every name has been used
 HABIT_NAMES = [
     "Membaca Buku", "Olahraga Pagi", "Minum 2L Air", "Belajar Python",
     "Meditasi 10 Menit", "Menulis Jurnal", "Membersihkan Kamar", "Berjalan Kaki 30 Menit",
     "Tidak Makan Gorengan", "Tidur 8 Jam", "Menyiram Tanaman", "Beribadah Tepat Waktu"
 ]
+PRIORITY_WEIGHTS = [3, 5, 2]  # Low, Medium, High
+UNMARK_RATE = 0.05  # share of missed days that were completed and then unmarked
+
+_INSERT_HABIT_SQL = """
+    INSERT INTO habits (id, name, category_id, start_date, frequency, status, notes, priority,
+                        created_at, updated_at, target_weekly)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_LOG_SQL = "INSERT INTO habit_logs (habit_id, date, completed, created_at) VALUES (?, ?, ?, ?)"
+
+def category_ids(db_manager: DatabaseManager) -> List[int]:
+    """Ids of HABIT_CATEGORIES, adding any the categories table is missing"""
+    ids = []
+    for category in HABIT_CATEGORIES:
+        ids.append(db_manager.get_category_id(category) or db_manager.add_category(category, COLORS['primary']))
+    return ids
+
+def generate_habits(rng: random.Random, count: int, days: int, end_day: date, completion_rate: float,
+                    first_id: int, categories: List[int]) -> Tuple[List[tuple], List[Tuple[int, int, float]]]:
+    """Build habit rows and, per habit, the (id, first day, completion rate) its logs follow"""
+    rows, plans = [], []
+    end = date_to_day_number(end_day)
+    # Habits starting today cannot have been created later than now; past end days are unaffected
+    latest = datetime_to_epoch(datetime.now())
+    for index in range(count):
+        habit_id = first_id + index
+        base_name = HABIT_NAMES[index % len(HABIT_NAMES)]
+        name = base_name if index < len(HABIT_NAMES) else f"{base_name} #{index // len(HABIT_NAMES) + 1}"
+        start = end - rng.randrange(days)
+        frequency = rng.randint(1, 7)
+        created_at = min(datetime_to_epoch(datetime.combine(day_number_to_date(start), datetime.min.time())
+                                           + timedelta(seconds=rng.randrange(86400))), latest)
+        # Each habit keeps its own rate around the requested one
+        rate = min(max(rng.gauss(completion_rate, 0.15), 0.0), 1.0)
+
+        rows.append((
+            habit_id, name, rng.choice(categories), start, frequency, 'Belum',
+            f"Catatan untuk kebiasaan '{name}'.",
+            rng.choices(HABIT_PRIORITIES, PRIORITY_WEIGHTS)[0],
+            created_at, created_at, frequency
+        ))
+        plans.append((habit_id, start, rate))
+    return rows, plans
+
+def generate_logs(rng: random.Random, plans: List[Tuple[int, int, float]], end_day: date) -> Iterator[tuple]:
+    """Stream habit_logs rows: completed days at each habit's rate, a few unmarked ones"""
+    end = date_to_day_number(end_day)
+    for habit_id, start, rate in plans:
+        for day in range(start, end + 1):
+            roll = rng.random()
+            if roll < rate:
+                completed = 1
+            elif roll < rate + (1 - rate) * UNMARK_RATE:
+                completed = 0
+            else:
+                continue
+            # Logged at 20:00 UTC of the day
+            yield (habit_id, day, completed, day * 86400 + 20 * 3600)
+
+def insert_rows(conn: sqlite3.Connection, sql: str, rows: Iterator[tuple], batch_size: int, label: str) -> int:
+    """executemany rows in transactions of batch_size, printing rows per second"""
+    total = 0
+    start = time.perf_counter()
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        with conn:
+            conn.executemany(sql, batch)
+        total += len(batch)
+        print(f"  {total:,} {label} ({total / (time.perf_counter() - start):,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"Inserted {total:,} {label} in {elapsed:.1f} s ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+    return total
+
+def seed_database(db_path: str = DATABASE_PATH, habits: int = len(HABIT_NAMES), days: int = 30,
+                  completion_rate: float = 0.6, seed: int = 42, end_day: date = None,
+                  batch_size: int = 50000, keep: bool = False) -> Dict[str, int]:
+    """Populate the database with a deterministic synthetic dataset"""
+    rng = random.Random(seed)
+    end_day = end_day or date.today()
 
-CATEGORIES = ["Kesehatan", "Belajar", "Produktivitas", "Ibadah", "Hobi", "Pekerjaan Rumah"]
-PRIORITIES = ["Tinggi", "Medium", "Rendah"]
-STATUSES = ["Belum", "Selesai"]
+    # First, ensure the database and tables exist by initializing the manager
+    db_manager = DatabaseManager(db_path)
+    categories = category_ids(db_manager)
 
-def seed_database():
-    """Clears the existing habits and populates the database with sample data."""
+    conn = sqlite3.connect(db_path)
     try:
-        # First, ensure the database and tables exist by initializing the manager
-        print("Initializing database manager to ensure tables exist...")
-        db_manager = DatabaseManager(DB_PATH)
-        print("Database tables are ready.")
-
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # 1. Clear existing data
-        cursor.execute("DELETE FROM habits;")
-        print("Cleared existing habits from the database.")
-
-        # 2. Insert new sample data
-        for i in range(len(HABIT_NAMES)):
-            name = HABIT_NAMES[i]
-            category = random.choice(CATEGORIES)
-            frequency = random.randint(1, 5)
-            start_date = (date.today() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d")
-            status = random.choice(STATUSES)
-            priority = random.choice(PRIORITIES)
-            target_weekly = frequency
-            notes = f"Catatan untuk kebiasaan '{name}'."
-            created_at = date.today().strftime("%Y-%m-%d %H:%M:%S")
-            updated_at = created_at
-
-            # For demonstration, some habits are completed
-            total_completed = 0
-            streak_count = 0
-            if status == 'Selesai':
-                total_completed = random.randint(1, target_weekly)
-                streak_count = random.randint(1, 7)
-
-            sql = """
-                INSERT INTO habits (name, category, frequency, start_date, status, priority,
-                                    target_weekly, notes, created_at, updated_at, total_completed, streak_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-            """
-            cursor.execute(sql, (name, category, frequency, start_date, status, priority,
-                                 target_weekly, notes, created_at, updated_at, total_completed, streak_count))
-
-        conn.commit()
-        print(f"Successfully inserted {len(HABIT_NAMES)} sample habits into the database.")
+        conn.execute("PRAGMA foreign_keys = ON")
+        # Throwaway data, durability is not worth the fsyncs
+        conn.execute("PRAGMA synchronous = OFF")
 
+        if not keep:
+            with conn:
+                conn.execute("DELETE FROM habit_logs")
+                conn.execute("DELETE FROM habits")
+            print("Cleared existing habits and logs from the database.")
+
+        # Explicit ids so logs can be generated without reading habits back
+        cursor = conn.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'habits'), 0),
+                       COALESCE((SELECT MAX(id) FROM habits), 0))
+        """)
+        first_id = cursor.fetchone()[0] + 1
+
+        habit_rows, plans = generate_habits(rng, habits, days, end_day, completion_rate, first_id, categories)
+        if keep:
+            # Keep names unique next to the habits that are already there
+            habit_rows = [row[:1] + (f"{row[1]} ({row[0]})",) + row[2:] for row in habit_rows]
+        habit_count = insert_rows(conn, _INSERT_HABIT_SQL, habit_rows, batch_size, "habits")
+        log_count = insert_rows(conn, _INSERT_LOG_SQL, generate_logs(rng, plans, end_day), batch_size, "habit logs")
+
+        # Habits completed on the last day count as done
+        with conn:
+            conn.execute("""
+                UPDATE habits SET status = 'Selesai'
+                WHERE id >= ? AND id IN (SELECT habit_id FROM habit_logs WHERE date = ? AND completed = 1)
+            """, (first_id, date_to_day_number(end_day)))
+    finally:
+        conn.close()
+
+    # Streaks and totals in one set-based pass instead of per log
+    db_manager.rebuild_statistics(progress_callback=lambda step, total, message: print(f"  [{step}/{total}] {message}"))
+    db_manager.close()
+    return {'habits': habit_count, 'logs': log_count}
+
+def main():
+    """Parse the generator options and seed the database"""
+    parser = argparse.ArgumentParser(description="Fill the DailyRoutine database with synthetic habits and logs")
+    parser.add_argument("--db", default=DATABASE_PATH, help="database file to fill")
+    parser.add_argument("--habits", type=int, default=len(HABIT_NAMES), help="number of habits")
+    parser.add_argument("--days", type=int, default=30, help="days of history per habit at most")
+    parser.add_argument("--completion-rate", type=float, default=0.6, help="average share of days completed")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--end-date", help="last day of history (YYYY-MM-DD), default today")
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per transaction")
+    parser.add_argument("--keep", action="store_true", help="add to the existing habits instead of replacing them")
+    args = parser.parse_args()
+
+    if args.habits < 0 or args.days < 1 or args.batch_size < 1 or not 0 <= args.completion_rate <= 1:
+        parser.error("--habits must be >= 0, --days and --batch-size >= 1, --completion-rate within 0..1")
+    end_day = date.fromisoformat(args.end_date) if args.end_date else date.today()
+
+    print("Starting database seeding process...")
+    start = time.perf_counter()
+    try:
+        counts = seed_database(args.db, args.habits, args.days, args.completion_rate, args.seed,
+                               end_day, args.batch_size, args.keep)
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
-    finally:
-        if conn:
-            conn.close()
+        raise SystemExit(1)
+
+    elapsed = time.perf_counter() - start
+    rows = counts['habits'] + counts['logs']
+    print(f"Seeded {counts['habits']:,} habits and {counts['logs']:,} logs in {elapsed:.1f} s "
+          f"({rows / elapsed if elapsed else 0:,.0f} rows/s overall)")
 
 if __name__ == '__main__':
-    print("Starting database seeding process...")
-    seed_database()
+    main()
@@ -0,0 +1,67 @@
+"""
+Startup report for DailyRoutine application
+
+Shows which modules dominate import time and how long opening the
+database takes, so startup regressions are easy to spot.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from config.constants import DATABASE_PATH
+
+def measure_imports(module: str, top: int) -> None:
+    """Import module in a fresh interpreter with -X importtime and print the slowest imports"""
+    probe = (
+        f"import {module}, sys; "
+        "print('reportlab loaded' if 'reportlab' in sys.modules else 'reportlab not loaded')"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+        return
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+
+    total_us = max((cumulative for cumulative, _, name in timings if name == module), default=0)
+    print(f"Importing {module}: {total_us / 1000:.1f} ms ({result.stdout.strip()})")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, name in sorted(timings, reverse=True)[:top]:
+        print(f"{cumulative / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+def measure_database(db_path: str) -> None:
+    """Time opening the database twice: the second open skips schema creation"""
+    from database.database import DatabaseManager
+
+    for attempt in ("first open", "second open"):
+        start = time.perf_counter()
+        manager = DatabaseManager(db_path)
+        elapsed = (time.perf_counter() - start) * 1000
+        manager.close()
+        print(f"DatabaseManager {attempt}: {elapsed:.1f} ms")
+
+def main():
+    """Print the startup report"""
+    parser = argparse.ArgumentParser(description="Report DailyRoutine startup costs")
+    parser.add_argument("--module", default="ui.main_window", help="module to profile imports of")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--db", default=DATABASE_PATH, help="database file to open")
+    args = parser.parse_args()
+
+    measure_imports(args.module, args.top)
+    print()
+    measure_database(args.db)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the DailyRoutine tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# The application imports its packages from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A DatabaseManager on a fresh database file"""
+    manager = DatabaseManager(str(tmp_path / "habits.db"))
+    yield manager
+    manager.close()
@@ -0,0 +1,31 @@
+"""
+Tests for the per-thread connections of DatabaseManager
+"""
+
+import threading
+
+
+def run_in_thread(func):
+    """Run func on a new thread and wait for it"""
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+def test_thread_reuses_its_connection(db):
+    connections = []
+
+    def query_repeatedly():
+        for _ in range(50):
+            connections.append(db._get_connection())
+            db.count_habits()
+
+    run_in_thread(query_repeatedly)
+    assert len(set(map(id, connections))) == 1
+    assert db.thread_connection_count() == 1
+
+
+def test_connections_of_finished_threads_are_closed(db):
+    for _ in range(20):
+        run_in_thread(db.count_habits)
+    assert db.thread_connection_count() == 1
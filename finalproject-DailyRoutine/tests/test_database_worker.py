@@ -0,0 +1,30 @@
+"""
+Tests for the background DatabaseExecutor
+"""
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QCoreApplication
+
+from ui.database_worker import DatabaseExecutor
+
+
+@pytest.fixture(scope="module")
+def app():
+    """The Qt application the executor delivers results through"""
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_jobs_share_a_bounded_set_of_connections(app, db):
+    executor = DatabaseExecutor(max_readers=2)
+    results = []
+    for _ in range(200):
+        executor.submit(db.count_habits, on_result=results.append)
+        executor.submit(db.get_statistics, write=True)
+    executor.shutdown()
+    app.processEvents()
+
+    # Two readers and one writer, however many jobs they ran
+    assert db.thread_connection_count() <= 3
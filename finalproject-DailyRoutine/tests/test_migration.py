@@ -0,0 +1,74 @@
+"""
+Tests for upgrading databases written by older versions
+"""
+
+import sqlite3
+
+from database.database import DatabaseManager
+
+# Schema of the first release, before streaks, integer dates and category ids
+BASELINE_SCHEMA = """
+    CREATE TABLE habits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        category TEXT NOT NULL,
+        start_date TEXT NOT NULL,
+        frequency INTEGER NOT NULL CHECK (frequency >= 1 AND frequency <= 7),
+        status TEXT NOT NULL DEFAULT 'Belum',
+        notes TEXT,
+        priority TEXT NOT NULL DEFAULT 'Medium',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        target_weekly INTEGER NOT NULL DEFAULT 1,
+        streak_count INTEGER NOT NULL DEFAULT 0,
+        total_completed INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE habit_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        habit_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        completed BOOLEAN NOT NULL DEFAULT 0,
+        notes TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (habit_id) REFERENCES habits (id) ON DELETE CASCADE
+    );
+    CREATE TABLE categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        color TEXT NOT NULL,
+        icon TEXT
+    );
+"""
+
+
+def create_baseline_database(path):
+    """A first-release database with one habit completed on three consecutive days"""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("""
+        INSERT INTO habits (name, category, start_date, frequency, created_at, updated_at,
+                            streak_count, total_completed)
+        VALUES ('Membaca', 'Umum', '2024-01-01', 7, '2024-01-01T08:00:00', '2024-01-03T08:00:00', 3, 3)
+    """)
+    conn.executemany(
+        "INSERT INTO habit_logs (habit_id, date, completed, created_at) VALUES (1, ?, 1, ?)",
+        [(day, f"{day}T08:00:00") for day in ('2024-01-01', '2024-01-02', '2024-01-03')]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_upgrade_backfills_streaks(tmp_path):
+    path = str(tmp_path / "habits.db")
+    create_baseline_database(path)
+
+    db = DatabaseManager(path)
+    try:
+        habit = db.get_habit(1)
+        assert (habit['streak_count'], habit['longest_streak'], habit['total_completed']) == (3, 3, 3)
+
+        db.mark_habit_complete(1, '2024-01-04')
+        habit = db.get_habit(1)
+        assert (habit['streak_count'], habit['longest_streak'], habit['total_completed']) == (4, 4, 4)
+    finally:
+        db.close()
@@ -0,0 +1,63 @@
+"""
+Tests for the query profiler
+"""
+
+import pytest
+
+from database.database import DatabaseManager
+from database.profiler import QueryProfiler, _is_full_scan
+
+TABLES = {"habits", "habit_logs", "archive.habit_logs", "h"}
+
+
+@pytest.mark.parametrize("plan_line, flagged", [
+    ("SCAN habits", True),
+    ("SCAN h", True),
+    ("SCAN archive.habit_logs", True),
+    ("SCAN habits USING COVERING INDEX idx_habits_status", False),
+    ("SEARCH habits USING INTEGER PRIMARY KEY (rowid=?)", False),
+    ("SCAN CONSTANT ROW", False),
+    ("SCAN run", False),
+    ("SCAN (subquery-1)", False),
+    ("SCAN sqlite_schema", False),
+    ("SCAN habits_fts VIRTUAL TABLE INDEX 0:", False),
+])
+def test_is_full_scan(plan_line, flagged):
+    assert _is_full_scan(plan_line, TABLES) is flagged
+
+
+def test_only_real_tables_are_reported(tmp_path):
+    profiler = QueryProfiler(log_path=None)
+    conn = profiler.connect(str(tmp_path / "profile.db"))
+    conn.execute("CREATE TABLE habits (id INTEGER PRIMARY KEY, name TEXT)")
+
+    conn.execute("SELECT 1").fetchall()
+    conn.execute("""
+        WITH RECURSIVE run(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM run WHERE n < 5)
+        SELECT n FROM run
+    """).fetchall()
+    conn.execute("SELECT h.name FROM habits AS h WHERE h.name = 'x'").fetchall()
+    conn.execute("CREATE TEMP TABLE work AS SELECT id FROM habits")
+    conn.execute("SELECT w.id FROM work AS w").fetchall()
+    conn.close()
+
+    assert list(profiler.full_scans.values()) == [["SCAN h"]]
+
+
+def test_generator_operations_span_iteration(tmp_path):
+    db = DatabaseManager(str(tmp_path / "habits.db"), profiler=QueryProfiler(log_path=None))
+    try:
+        db.bulk_create_habits([
+            {'name': f"Habit {number}", 'category': 'Umum', 'start_date': '2024-01-01', 'frequency': 3}
+            for number in range(50)
+        ])
+        before = db.profiler.operation_statements.get('iter_habits', 0)
+        habits = list(db.iter_habits(chunk_size=20))
+        operation = db.get_query_profile()['operations']['iter_habits']
+    finally:
+        db.close()
+
+    assert len(habits) == 50
+    assert operation['count'] == 1
+    # Three pages, each a query run while iter_habits was running
+    assert operation['statements'] - before >= 3
@@ -0,0 +1,155 @@
+"""
+Background database executor for DailyRoutine application
+"""
+
+import itertools
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _JobSignals(QObject):
+    """Signals a job emits from its worker thread"""
+
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _DatabaseJob(QRunnable):
+    """A single database call run on a pool thread"""
+
+    def __init__(self, job_id: int, func: Callable, args: tuple, kwargs: dict,
+                 is_current: Callable[[int], bool]):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.is_current = is_current
+        self.signals = _JobSignals()
+
+    def run(self):
+        """Run the call unless a newer job has superseded it meanwhile"""
+        if not self.is_current(self.job_id):
+            self.signals.finished.emit(self.job_id, None)
+            return
+
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, e)
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+
+class DatabaseExecutor(QObject):
+    """Runs database calls off the GUI thread and hands results back through signals
+
+    Reads run on a small pool, writes on a single thread so they apply in the
+    order they were submitted. Jobs submitted on a channel supersede earlier
+    jobs on the same channel: those are skipped if not started yet and their
+    results are dropped otherwise.
+    """
+
+    job_finished = pyqtSignal(int, object)
+    job_failed = pyqtSignal(int, object)
+
+    def __init__(self, parent: Optional[QObject] = None, max_readers: int = 2):
+        super().__init__(parent)
+        self._read_pool = QThreadPool(self)
+        self._read_pool.setMaxThreadCount(max_readers)
+        self._write_pool = QThreadPool(self)
+        self._write_pool.setMaxThreadCount(1)
+        # Idle threads are kept rather than expired, so each keeps one database connection
+        self._read_pool.setExpiryTimeout(-1)
+        self._write_pool.setExpiryTimeout(-1)
+
+        self._job_ids = itertools.count(1)
+        # job id -> (channel, signals, on_result, on_error)
+        self._pending: Dict[int, Tuple[Optional[str], _JobSignals,
+                                       Optional[Callable], Optional[Callable]]] = {}
+        # channel -> id of the newest job submitted on it
+        self._latest: Dict[str, int] = {}
+        self.stale_results = 0
+
+    def submit(self, func: Callable, *args, channel: Optional[str] = None, write: bool = False,
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None, **kwargs) -> int:
+        """Queue func(*args, **kwargs) and return the job id"""
+        job_id = next(self._job_ids)
+        job = _DatabaseJob(job_id, func, args, kwargs, self._is_current)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+
+        if channel is not None:
+            self._latest[channel] = job_id
+        # Keep the signals object alive until the result is delivered
+        self._pending[job_id] = (channel, job.signals, on_result, on_error)
+
+        pool = self._write_pool if write else self._read_pool
+        pool.start(job)
+        return job_id
+
+    def cancel(self, channel: str):
+        """Drop whatever is pending on channel"""
+        self._latest.pop(channel, None)
+
+    def is_pending(self, channel: str) -> bool:
+        """Whether the newest job on channel has not delivered its result yet"""
+        return self._latest.get(channel) in self._pending
+
+    def shutdown(self, timeout_ms: int = 5000):
+        """Stop accepting results and wait for running jobs to finish"""
+        self._latest.clear()
+        self._read_pool.clear()
+        self._read_pool.waitForDone(timeout_ms)
+        self._write_pool.waitForDone(timeout_ms)
+        self._pending.clear()
+
+    def _is_current(self, job_id: int) -> bool:
+        """Whether job_id is still wanted; called from worker threads"""
+        entry = self._pending.get(job_id)
+        if entry is None:
+            return False
+        channel = entry[0]
+        return channel is None or self._latest.get(channel) == job_id
+
+    def _take(self, job_id: int):
+        """Remove a finished job, returning its callbacks if its result is still wanted"""
+        current = self._is_current(job_id)
+        entry = self._pending.pop(job_id, None)
+        if entry is None:
+            return None
+
+        channel = entry[0]
+        if not current:
+            self.stale_results += 1
+            return None
+        if channel is not None:
+            del self._latest[channel]
+        return entry
+
+    def _on_finished(self, job_id: int, result: Any):
+        """Deliver a result on the GUI thread"""
+        entry = self._take(job_id)
+        if entry is None:
+            return
+
+        on_result = entry[2]
+        if on_result is not None:
+            on_result(result)
+        self.job_finished.emit(job_id, result)
+
+    def _on_failed(self, job_id: int, error: Exception):
+        """Deliver an error on the GUI thread"""
+        entry = self._take(job_id)
+        if entry is None:
+            return
+
+        on_error = entry[3]
+        if on_error is not None:
+            on_error(error)
+        else:
+            print(f"Error in database job: {error}")
+        self.job_failed.emit(job_id, error)
@@ -0,0 +1,539 @@
+"""
+Habit list model, delegate and view
+
+Habits are painted by HabitDelegate straight from HabitListModel rows, as
+cards in the grid view or as rows in the list view, so no widget is built
+per habit and only the visible items are ever drawn.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QFrame, QListView, QMenu, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+)
+from PyQt5.QtCore import (
+    QAbstractListModel, QEvent, QModelIndex, QPersistentModelIndex, QPoint, QRect, QSize, Qt, QTimer, pyqtSignal
+)
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen, QPixmap
+
+from utils.helpers import format_date_for_display, get_priority_color, get_status_color
+
+# Height of a grid card and of a list row
+CARD_HEIGHT = 150
+ROW_HEIGHT = 65
+
+# Buttons of a list row, left to right
+LIST_BUTTONS = [('details', "Details"), ('edit', "Edit"), ('delete', "Delete")]
+
+# Beyond this many separate inserted/removed blocks a model reset is cheaper
+MAX_DIFF_RUNS = 64
+
+# Rows above and below the viewport rendered ahead of scrolling
+OVERSCAN_ROWS = 2
+
+
+def _runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """Group ascending row numbers into (first, last) blocks of consecutive rows"""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+class HabitListModel(QAbstractListModel):
+    """Flat list model over habit dicts, in display order"""
+
+    HabitRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._habits: List[Dict[str, Any]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of habits shown"""
+        return 0 if parent.isValid() else len(self._habits)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """The habit dict for HabitRole, its name and notes for display and tooltips"""
+        if not index.isValid():
+            return None
+        habit = self._habits[index.row()]
+        if role == self.HabitRole:
+            return habit
+        if role == Qt.DisplayRole:
+            return habit.get('name')
+        if role == Qt.ToolTipRole:
+            return habit.get('notes') or None
+        return None
+
+    def habit_at(self, row: int) -> Dict[str, Any]:
+        """The habit shown at row"""
+        return self._habits[row]
+
+    def set_habits(self, habits: List[Dict[str, Any]]) -> None:
+        """Show a new list of habits, keyed by id against the one shown
+
+        Rows of habits that are gone are removed, the remaining ones moved
+        into the new order and new habits inserted, and only rows whose
+        habit changed are repainted, so the view keeps its scroll position.
+        When the lists share too little, the model is reset instead.
+        """
+        new_ids = {habit['id'] for habit in habits}
+        old_ids = {habit['id'] for habit in self._habits}
+        removed = _runs([row for row, habit in enumerate(self._habits) if habit['id'] not in new_ids])
+        inserted = _runs([row for row, habit in enumerate(habits) if habit['id'] not in old_ids])
+        if len(removed) + len(inserted) > MAX_DIFF_RUNS:
+            self.beginResetModel()
+            self._habits = list(habits)
+            self.endResetModel()
+            return
+
+        # Back to front, so the rows of earlier blocks stay where they are
+        for first, last in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._habits[first:last + 1]
+            self.endRemoveRows()
+
+        order = [habit['id'] for habit in habits if habit['id'] in old_ids]
+        if [habit['id'] for habit in self._habits] != order:
+            self.layoutAboutToBeChanged.emit()
+            by_id = {habit['id']: habit for habit in self._habits}
+            new_rows = {habit_id: row for row, habit_id in enumerate(order)}
+            old_indexes = self.persistentIndexList()
+            new_indexes = [self.index(new_rows[self._habits[index.row()]['id']]) for index in old_indexes]
+            self._habits = [by_id[habit_id] for habit_id in order]
+            self.changePersistentIndexList(old_indexes, new_indexes)
+            self.layoutChanged.emit()
+
+        # Front to back, every block lands after the rows that precede it
+        for first, last in inserted:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._habits[first:first] = habits[first:last + 1]
+            self.endInsertRows()
+
+        changed = [row for row, habit in enumerate(habits) if self._habits[row] != habit]
+        self._habits = list(habits)
+        for first, last in _runs(changed):
+            self.dataChanged.emit(self.index(first), self.index(last),
+                                  [self.HabitRole, Qt.DisplayRole, Qt.ToolTipRole])
+
+    def append_habits(self, habits: List[Dict[str, Any]]) -> None:
+        """Add habits after the last row, e.g. a freshly loaded page"""
+        if not habits:
+            return
+        start = len(self._habits)
+        self.beginInsertRows(QModelIndex(), start, start + len(habits) - 1)
+        self._habits.extend(habits)
+        self.endInsertRows()
+
+    def insert_habit(self, row: int, habit: Dict[str, Any]) -> None:
+        """Show habit at row"""
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._habits.insert(row, habit)
+        self.endInsertRows()
+
+    def remove_habit(self, row: int) -> None:
+        """Stop showing the habit at row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._habits[row]
+        self.endRemoveRows()
+
+    def update_habit(self, row: int, habit: Dict[str, Any]) -> None:
+        """Replace the habit at row and repaint it"""
+        self._habits[row] = habit
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.HabitRole, Qt.DisplayRole, Qt.ToolTipRole])
+
+
+class HabitDelegate(QStyledItemDelegate):
+    """Paints habits as compact cards or list rows and hit-tests their buttons"""
+
+    # Signals
+    edit_clicked = pyqtSignal(int)  # habit_id
+    delete_clicked = pyqtSignal(int)  # habit_id
+    status_changed = pyqtSignal(int, str)  # habit_id, new_status
+    details_clicked = pyqtSignal(int)  # habit_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.view_mode = 'list'
+        self.item_width = 300
+        # (habit id, button name) under the mouse, and the one pressed
+        self.hover: Optional[Tuple[int, str]] = None
+        self.pressed: Optional[Tuple[int, str]] = None
+        # Renderings of the items in and around the viewport, least recently
+        # drawn first; the view sizes it to a screenful plus the overscan rows
+        self.pool: "OrderedDict[tuple, Tuple[Dict[str, Any], QPixmap]]" = OrderedDict()
+        self.pool_size = 64
+
+        self.card_name_font = QFont("Segoe UI", 12, QFont.Bold)
+        self.row_name_font = QFont("Segoe UI", 11, QFont.Bold)
+        self.badge_font = QFont("Segoe UI", 9, QFont.Bold)
+        self.info_font = QFont("Segoe UI", 10)
+        self.small_font = QFont("Segoe UI", 9)
+        self.status_font = QFont("Segoe UI", 10, QFont.Bold)
+        self.menu_font = QFont("Segoe UI", 14, QFont.Bold)
+        self.button_font = QFont("Segoe UI", 8, QFont.Medium)
+        self.button_metrics = QFontMetrics(self.button_font)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        """Same size for every habit, set by the view from its width"""
+        return QSize(self.item_width, CARD_HEIGHT if self.view_mode == 'grid' else ROW_HEIGHT)
+
+    def button_rects(self, rect: QRect) -> Dict[str, QRect]:
+        """Where the buttons of an item painted in rect are"""
+        if self.view_mode == 'grid':
+            return {'menu': QRect(rect.right() - 40, rect.top() + 12, 28, 28)}
+
+        rects = {}
+        right = rect.right() - 15
+        for name, text in reversed(LIST_BUTTONS):
+            width = self.button_metrics.horizontalAdvance(text) + 24
+            rects[name] = QRect(right - width + 1, rect.center().y() - 13, width, 26)
+            right -= width + 5
+        return rects
+
+    def button_at(self, rect: QRect, pos: QPoint) -> Optional[str]:
+        """Name of the button of an item painted in rect under pos, or None"""
+        for name, button_rect in self.button_rects(rect).items():
+            if button_rect.contains(pos):
+                return name
+        return None
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        """Draw the habit of index as a card or a row"""
+        ratio = option.widget.devicePixelRatioF() if option.widget else 1.0
+        pixmap = self.rendered(index.data(HabitListModel.HabitRole), option.rect.size(),
+                               bool(option.state & QStyle.State_MouseOver), ratio)
+        painter.drawPixmap(option.rect.topLeft(), pixmap)
+
+    def rendered(self, habit: Dict[str, Any], size: QSize, hovered: bool, ratio: float = 1.0) -> QPixmap:
+        """The habit painted at size, taken from the pool unless it changed since"""
+        button = self.hover[1] if self.hover and self.hover[0] == habit['id'] else None
+        key = (habit['id'], self.view_mode, size.width(), size.height(), hovered, button, ratio)
+        entry = self.pool.get(key)
+        if entry is not None and entry[0] == habit:
+            self.pool.move_to_end(key)
+            return entry[1]
+
+        pixmap = QPixmap(round(size.width() * ratio), round(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.view_mode == 'grid':
+            self.paint_card(painter, QRect(QPoint(0, 0), size), habit, hovered)
+        else:
+            self.paint_row(painter, QRect(QPoint(0, 0), size), habit, hovered)
+        painter.end()
+
+        self.pool[key] = (dict(habit), pixmap)
+        self.pool.move_to_end(key)
+        while len(self.pool) > self.pool_size:
+            self.pool.popitem(last=False)
+        return pixmap
+
+    def set_pool_size(self, size: int) -> None:
+        """Keep at most size renderings"""
+        self.pool_size = max(size, 1)
+        while len(self.pool) > self.pool_size:
+            self.pool.popitem(last=False)
+
+    def paint_card(self, painter: QPainter, rect: QRect, habit: Dict[str, Any], hovered: bool) -> None:
+        """Compact card: name, priority badge, menu button, category, frequency and status"""
+        card = rect.adjusted(0, 0, -1, -3)
+        if hovered:
+            # Stands in for the drop shadow the card widgets used to show on hover
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 0, 0, 25))
+            painter.drawRoundedRect(card.translated(0, 2), 8, 8)
+
+        painter.setPen(QPen(QColor("#dee2e6" if hovered else "#e9ecef"), 1))
+        painter.setBrush(QColor("#ffffff"))
+        painter.drawRoundedRect(card, 8, 8)
+
+        # Priority colored left border
+        path = QPainterPath()
+        path.addRoundedRect(float(card.left()), float(card.top()), float(card.width()), float(card.height()), 8, 8)
+        painter.save()
+        painter.setClipPath(path)
+        painter.fillRect(QRect(card.left(), card.top(), 4, card.height() + 1),
+                         QColor(get_priority_color(habit.get('priority', 'Medium'))))
+        painter.restore()
+
+        left, width = card.left() + 16, card.width() - 32
+        name_rect = QRect(left, card.top() + 12, width - 36, 24)
+        painter.setFont(self.card_name_font)
+        painter.setPen(QColor("#212529"))
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.card_name_font).elidedText(
+                             habit.get('name', 'Unnamed Habit'), Qt.ElideRight, name_rect.width()))
+
+        priority = habit.get('priority', 'Medium')
+        badge_width = QFontMetrics(self.badge_font).horizontalAdvance(priority) + 16
+        self.paint_pill(painter, QRect(left, card.top() + 40, badge_width, 20), priority,
+                        get_priority_color(priority), self.badge_font)
+
+        self.paint_button(painter, self.button_rects(rect)['menu'], "⋮", 'menu', habit)
+
+        info_rect = QRect(left, card.top() + 70, width, 20)
+        painter.setFont(self.info_font)
+        painter.setPen(QColor("#6c757d"))
+        frequency = f"🔄 {habit.get('frequency', 1)}x/week"
+        frequency_width = QFontMetrics(self.info_font).horizontalAdvance(frequency)
+        painter.drawText(info_rect, Qt.AlignRight | Qt.AlignVCenter, frequency)
+        painter.drawText(info_rect.adjusted(0, 0, -frequency_width - 8, 0), Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.info_font).elidedText(
+                             f"📂 {habit.get('category', 'Unknown')}", Qt.ElideRight, width - frequency_width - 8))
+
+        status = habit.get('status', 'Belum')
+        self.paint_pill(painter, QRect(left, card.bottom() - 16 - 28, width, 28), status,
+                        get_status_color(status), self.status_font)
+
+    def paint_row(self, painter: QPainter, rect: QRect, habit: Dict[str, Any], hovered: bool) -> None:
+        """List row: priority bar, name and category, start date, status and buttons"""
+        row = rect.adjusted(0, 0, -1, -1)
+        painter.setPen(QPen(QColor("#cce5ff" if hovered else "#e9ecef"), 1))
+        painter.setBrush(QColor("#f8f9fa" if hovered else "#ffffff"))
+        painter.drawRoundedRect(row, 8, 8)
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(get_priority_color(habit.get('priority', 'Medium'))))
+        painter.drawRoundedRect(QRect(row.left() + 10, row.top() + 8, 5, row.height() - 16), 2, 2)
+
+        buttons = self.button_rects(rect)
+        for name, text in LIST_BUTTONS:
+            self.paint_button(painter, buttons[name], text, name, habit)
+
+        status = habit.get('status', 'Belum')
+        status_rect = QRect(buttons['details'].left() - 15 - 80, row.top(), 80, row.height())
+        painter.setFont(self.status_font)
+        painter.setPen(QColor(get_status_color(status)))
+        painter.drawText(status_rect, Qt.AlignCenter, status)
+
+        started = f"Started: {format_date_for_display(habit.get('start_date', ''))}"
+        date_width = max(QFontMetrics(self.small_font).horizontalAdvance(started), 80)
+        date_rect = QRect(status_rect.left() - 15 - date_width, row.top(), date_width, row.height())
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#6c757d"))
+        painter.drawText(date_rect, Qt.AlignLeft | Qt.AlignVCenter, started)
+
+        text_left = row.left() + 30
+        text_width = max(date_rect.left() - 15 - text_left, 0)
+        painter.setFont(self.row_name_font)
+        painter.setPen(QColor("#343a40"))
+        painter.drawText(QRect(text_left, row.top() + 10, text_width, 22), Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.row_name_font).elidedText(
+                             habit.get('name', 'N/A'), Qt.ElideRight, text_width))
+        painter.setFont(self.small_font)
+        painter.setPen(QColor("#6c757d"))
+        painter.drawText(QRect(text_left, row.top() + 33, text_width, 18), Qt.AlignLeft | Qt.AlignVCenter,
+                         QFontMetrics(self.small_font).elidedText(
+                             habit.get('category', 'N/A'), Qt.ElideRight, text_width))
+
+    def paint_pill(self, painter: QPainter, rect: QRect, text: str, color: str, font: QFont) -> None:
+        """Rounded badge with white text"""
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawRoundedRect(rect, rect.height() / 2, rect.height() / 2)
+        painter.setFont(font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    def paint_button(self, painter: QPainter, rect: QRect, text: str, name: str, habit: Dict[str, Any]) -> None:
+        """A button, highlighted while the mouse is over it"""
+        hovered = self.hover == (habit['id'], name)
+        if name == 'menu':
+            background, border, color = ("#f8f9fa", None, "#495057") if hovered else (None, None, "#6c757d")
+            font = self.menu_font
+        elif name == 'delete':
+            background, border, color = ("#fa5252", "#fa5252", "#ffffff") if hovered else (None, "#f1f3f5", "#fa5252")
+            font = self.button_font
+        else:
+            background, border, color = ("#f1f3f5", "#007bff", "#007bff") if hovered else (None, "#dee2e6", "#495057")
+            font = self.button_font
+
+        painter.setPen(QPen(QColor(border), 1) if border else Qt.NoPen)
+        painter.setBrush(QColor(background) if background else Qt.NoBrush)
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 5, 5)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    def editorEvent(self, event: QEvent, model: HabitListModel, option: QStyleOptionViewItem,
+                    index: QModelIndex) -> bool:
+        """Click the button under the mouse; double-clicking elsewhere edits the habit"""
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        habit = index.data(HabitListModel.HabitRole)
+        button = self.button_at(option.rect, event.pos())
+        if event.type() == QEvent.MouseButtonPress:
+            self.pressed = (habit['id'], button) if button else None
+            return button is not None
+
+        if event.type() == QEvent.MouseButtonDblClick:
+            if button is None:
+                self.edit_clicked.emit(habit['id'])
+                return True
+            # The second click of a double-click still presses the button
+            self.pressed = (habit['id'], button)
+            return True
+
+        # A button only fires when released over the one that was pressed
+        pressed, self.pressed = self.pressed, None
+        if button is None or pressed != (habit['id'], button):
+            return False
+
+        if button == 'menu':
+            rect = self.button_rects(option.rect)['menu']
+            self.show_context_menu(habit, option.widget.viewport().mapToGlobal(rect.bottomLeft()), option.widget)
+        elif button == 'edit':
+            self.edit_clicked.emit(habit['id'])
+        elif button == 'delete':
+            self.delete_clicked.emit(habit['id'])
+        elif button == 'details':
+            self.details_clicked.emit(habit['id'])
+        return True
+
+    def show_context_menu(self, habit: Dict[str, Any], global_pos: QPoint, parent=None) -> None:
+        """Menu of the actions on a habit"""
+        habit_id = habit['id']
+        completed = habit.get('status', 'Belum') == 'Selesai'
+
+        menu = QMenu(parent)
+        menu.addAction("Edit Habit", lambda: self.edit_clicked.emit(habit_id))
+        menu.addAction("Delete Habit", lambda: self.delete_clicked.emit(habit_id))
+        menu.addSeparator()
+        menu.addAction("Mark Incomplete" if completed else "Mark Complete",
+                       lambda: self.status_changed.emit(habit_id, 'Belum' if completed else 'Selesai'))
+        menu.addAction("View Details", lambda: self.details_clicked.emit(habit_id))
+        menu.exec_(global_pos)
+
+
+class HabitListView(QListView):
+    """Shows a HabitListModel through a HabitDelegate, as a grid of cards or a list of rows"""
+
+    def __init__(self, delegate: HabitDelegate, columns: int, parent=None):
+        super().__init__(parent)
+        self.delegate = delegate
+        self.columns = columns
+        self.setItemDelegate(delegate)
+
+        # Every item has the delegate's size, so layout never asks each row
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        # Item whose button is highlighted, repainted alone when that changes
+        self.hover_index = QPersistentModelIndex()
+
+        # Renders the overscan rows once a scroll or resize has been handled
+        self.overscan_timer = QTimer(self)
+        self.overscan_timer.setSingleShot(True)
+        self.overscan_timer.setInterval(0)
+        self.overscan_timer.timeout.connect(self.render_overscan)
+        self.verticalScrollBar().valueChanged.connect(self.overscan_timer.start)
+
+    def set_view_mode(self, mode: str) -> None:
+        """Switch between 'grid' cards and 'list' rows"""
+        self.delegate.view_mode = mode
+        grid = mode == 'grid'
+        self.setFlow(QListView.LeftToRight if grid else QListView.TopToBottom)
+        self.setWrapping(grid)
+        self.setSpacing(10 if grid else 5)
+        self.delegate.pool.clear()
+        self.update_item_width()
+
+    def items_per_row(self) -> int:
+        """Habits shown side by side"""
+        return self.columns if self.delegate.view_mode == 'grid' else 1
+
+    def row_pitch(self) -> int:
+        """Vertical distance between the tops of two rows of items"""
+        return self.delegate.sizeHint(QStyleOptionViewItem(), QModelIndex()).height() + 2 * self.spacing()
+
+    def update_item_width(self) -> None:
+        """Size items to fill the viewport: columns cards per row, or one full-width row"""
+        # Spacing is added on both sides of every item
+        margin = 2 * self.spacing()
+        if self.delegate.view_mode == 'grid':
+            width = (self.viewport().width() - 1) // self.columns - margin
+        else:
+            width = self.viewport().width() - 1 - margin
+        self.delegate.item_width = max(width, 1)
+        # Drops the uniform item size cached from the old width
+        self.doItemsLayout()
+
+        # A screenful, a partly visible row at each edge, the overscan rows and a hovered variant
+        rows = self.viewport().height() // self.row_pitch() + 2 + 2 * OVERSCAN_ROWS
+        self.delegate.set_pool_size(rows * self.items_per_row() + 2)
+        self.overscan_timer.start()
+
+    def render_overscan(self) -> None:
+        """Render the OVERSCAN_ROWS rows above and below the viewport into the delegate's pool"""
+        model = self.model()
+        count = model.rowCount() if model is not None else 0
+        if count == 0:
+            return
+
+        pitch, per_row = self.row_pitch(), self.items_per_row()
+        top = self.verticalScrollBar().value()
+        first_row = max(top // pitch - OVERSCAN_ROWS, 0)
+        last_row = (top + self.viewport().height()) // pitch + OVERSCAN_ROWS
+        size = self.delegate.sizeHint(QStyleOptionViewItem(), QModelIndex())
+        ratio = self.devicePixelRatioF()
+        for row in range(first_row * per_row, min((last_row + 1) * per_row, count)):
+            self.delegate.rendered(model.data(model.index(row), HabitListModel.HabitRole), size, False, ratio)
+
+    def resizeEvent(self, event) -> None:
+        """Re-fit the items whenever the viewport width changes"""
+        super().resizeEvent(event)
+        self.update_item_width()
+
+    def mouseMoveEvent(self, event) -> None:
+        """Track the button under the mouse so the delegate can highlight it"""
+        index = self.indexAt(event.pos())
+        hover = None
+        if index.isValid():
+            button = self.delegate.button_at(self.visualRect(index), event.pos())
+            if button is not None:
+                hover = (index.data(HabitListModel.HabitRole)['id'], button)
+
+        if hover != self.delegate.hover:
+            self.delegate.hover = hover
+            self.viewport().setCursor(Qt.PointingHandCursor if hover else Qt.ArrowCursor)
+            if self.hover_index.isValid():
+                self.update(QModelIndex(self.hover_index))
+            self.hover_index = QPersistentModelIndex(index) if hover else QPersistentModelIndex()
+            if hover:
+                self.update(index)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        """Drop the button highlight when the mouse leaves"""
+        if self.delegate.hover is not None:
+            self.delegate.hover = None
+            self.viewport().unsetCursor()
+            if self.hover_index.isValid():
+                self.update(QModelIndex(self.hover_index))
+            self.hover_index = QPersistentModelIndex()
+        super().leaveEvent(event)
+
+    def contextMenuEvent(self, event) -> None:
+        """Right-click menu of the habit under the mouse"""
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            self.delegate.show_context_menu(index.data(HabitListModel.HabitRole), event.globalPos(), self)
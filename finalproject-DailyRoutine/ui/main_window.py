@@ -2,40 +2,75 @@
 Main Window for DailyRoutine application
 """
 
+import os
+import re
 import sys
+import time
 from typing import List, Dict, Any, Optional
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QLineEdit, QComboBox, QScrollArea,
+    QLabel, QPushButton, QLineEdit, QComboBox,
     QMenuBar, QStatusBar, QMessageBox, QGroupBox, QProgressBar, QAction,
-    QFrame, QSpacerItem, QSizePolicy, QGridLayout, QGraphicsDropShadowEffect
+    QFrame, QSpacerItem, QSizePolicy, QGraphicsDropShadowEffect, QFileDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap
 
-from config.constants import APP_NAME, AUTHOR, NIM, HABIT_CATEGORIES, HABIT_STATUS
-from database.database import db_manager
-from utils.export_utils import export_manager
+from config.constants import (
+    APP_NAME, AUTHOR, NIM, HABIT_CATEGORIES, HABIT_STATUS, BACKUP_INTERVAL_HOURS, SEARCH_DEBOUNCE_MS
+)
+from database.database import get_db_manager
+from utils.export_utils import get_export_manager
+from .database_worker import DatabaseExecutor
 from .habit_dialog import HabitDialog
-from .habit_card import HabitCard
 from .habit_details_dialog import HabitDetailsDialog
-from .habit_list_item import HabitListItem
+from .habit_view import HabitDelegate, HabitListModel, HabitListView
+from .refresh_scheduler import RefreshScheduler
 from utils.helpers import format_date_for_display, get_priority_color, get_status_color
 
 class MainWindow(QMainWindow):
     """Main application window"""
 
+    GRID_COLUMNS = 3
+
+    # Carries database change events from the writing thread to the GUI thread
+    habits_changed = pyqtSignal(object)
+    # Carries backup/restore progress (pages done, total) from the worker thread
+    backup_progress = pyqtSignal(int, int)
+
     def __init__(self):
         super().__init__()
         self.habits = []
         self.filtered_habits = []
+        # Keyset cursors for the next page; None once everything is loaded
+        self.habits_cursor = None
+        self.filtered_cursor = None
+        self.active_filters = {}
+        self.habits_total = 0
+        self.filtered_total = 0
+        # Lowercase search keys of the loaded habits by id, for in-memory search
+        self.search_keys = {}
+        # Database calls run here so slow queries never block painting
+        self.db_executor = DatabaseExecutor(self)
+        self.change_listener = None
+        # Merges the refreshes asked for within one event-loop tick
+        self.refresh = RefreshScheduler(self)
+        # Loaded habits re-apply the filters themselves
+        self.refresh.add_part('habits', self.load_habits, supersedes=['filters', 'filtered_count'])
+        self.refresh.add_part('filters', self.apply_filters, supersedes=['filtered_count'])
+        self.refresh.add_part('filtered_count', self.update_filtered_total)
+        self.refresh.add_part('statistics', self.update_statistics)
+        self.refresh.add_part('count', self.update_habit_count)
 
         self.setup_ui()
         self.setup_menu_bar()
         self.setup_status_bar()
         self.setup_styling()
         self.setup_connections()
-        self.load_habits()
+        self.setup_backup_schedule()
+
+        # Open the database once the event loop runs so the window paints first
+        self.refresh.request('habits', 'statistics')
 
     def add_shadow_effect(self, widget):
         """Apply a standard shadow effect to a widget."""
@@ -211,22 +246,15 @@ class MainWindow(QMainWindow):
 
         habit_list_layout.addWidget(header_frame)
 
-        # Scroll area for habit cards
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setObjectName("scrollArea")
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-
-        # Container widget
-        self.habit_container = QWidget()
-        self.habit_container.setObjectName("habitContainer")
-
-        # We will set the layout in update_habits_view
-        self.habit_layout = None
-
-        self.scroll_area.setWidget(self.habit_container)
-        habit_list_layout.addWidget(self.scroll_area)
+        # Habits are painted by the delegate, only the visible ones and
+        # without a widget per habit
+        self.habit_model = HabitListModel(self)
+        self.habit_delegate = HabitDelegate(self)
+        self.habit_view = HabitListView(self.habit_delegate, self.GRID_COLUMNS)
+        self.habit_view.setObjectName("habitView")
+        self.habit_view.setModel(self.habit_model)
+        self.habit_view.set_view_mode(self.current_view_mode)
+        habit_list_layout.addWidget(self.habit_view)
 
         content_layout.addWidget(habit_list_frame, 7)  # 70% width
 
@@ -409,6 +437,17 @@ class MainWindow(QMainWindow):
 
         file_menu.addSeparator()
 
+        backup_action = QAction('Backup Now', self)
+        backup_action.setShortcut('Ctrl+B')
+        backup_action.triggered.connect(lambda: self.start_backup(scheduled=False))
+        file_menu.addAction(backup_action)
+
+        restore_action = QAction('Restore from Backup...', self)
+        restore_action.triggered.connect(self.restore_backup)
+        file_menu.addAction(restore_action)
+
+        file_menu.addSeparator()
+
         exit_action = QAction('Exit', self)
         exit_action.setShortcut('Ctrl+Q')
         exit_action.triggered.connect(self.close)
@@ -511,31 +550,27 @@ class MainWindow(QMainWindow):
                 color: #6c757d;
             }
 
-            #scrollArea {
+            #habitView {
                 border: none;
                 background-color: transparent;
             }
 
-            #scrollArea QScrollBar:vertical {
+            #habitView QScrollBar:vertical {
                 background-color: #f8f9fa;
                 width: 8px;
                 border-radius: 4px;
             }
 
-            #scrollArea QScrollBar::handle:vertical {
+            #habitView QScrollBar::handle:vertical {
                 background-color: #dee2e6;
                 border-radius: 4px;
                 min-height: 20px;
             }
 
-            #scrollArea QScrollBar::handle:vertical:hover {
+            #habitView QScrollBar::handle:vertical:hover {
                 background-color: #adb5bd;
             }
 
-            #habitContainer {
-                background-color: transparent;
-            }
-
             #statsFrame {
                 background-color: #ffffff;
                 border-radius: 8px;
@@ -743,83 +778,260 @@ class MainWindow(QMainWindow):
         self.export_button.clicked.connect(lambda: self.export_data('pdf'))
         self.clear_filters_button.clicked.connect(self.clear_filters)
 
-        self.category_filter.currentTextChanged.connect(self.apply_filters)
-        self.status_filter.currentTextChanged.connect(self.apply_filters)
-        self.search_box.textChanged.connect(self.apply_filters)
+        # Typing restarts the timer, so a burst of keystrokes filters once
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(lambda: self.refresh.request('filters'))
+
+        self.category_filter.currentTextChanged.connect(lambda: self.refresh.request('filters'))
+        self.status_filter.currentTextChanged.connect(lambda: self.refresh.request('filters'))
+        self.search_box.textChanged.connect(self.filter_timer.start)
 
         # View mode connections
         self.grid_view_button.clicked.connect(lambda: self.set_view_mode('grid'))
         self.list_view_button.clicked.connect(lambda: self.set_view_mode('list'))
 
+        # Buttons and menu actions hit-tested by the habit delegate
+        self.habit_delegate.edit_clicked.connect(self.edit_habit)
+        self.habit_delegate.delete_clicked.connect(self.delete_habit)
+        self.habit_delegate.status_changed.connect(self.change_habit_status)
+        self.habit_delegate.details_clicked.connect(self.show_habit_details)
+
+        # Fetch further pages when scrolled near the end
+        self.habit_view.verticalScrollBar().valueChanged.connect(self.on_habits_scrolled)
+
+        # Patch the view from database change events instead of reloading
+        self.habits_changed.connect(self.apply_habit_change)
+
     def load_habits(self):
-        """Load habits from database"""
-        try:
-            self.habits = db_manager.get_all_habits()
-            self.filtered_habits = self.habits.copy()
-            self.update_habits_view()
-            self.update_statistics()
-            print(f"Loaded {len(self.habits)} habits")
-        except Exception as e:
-            print(f"Error loading habits: {e}")
-            QMessageBox.critical(self, "Error", f"Error loading habits: {e}")
+        """Load the first page of habits from database"""
+        self.db_executor.submit(
+            self.fetch_first_page, channel='habits',
+            on_result=self.on_habits_loaded,
+            on_error=lambda e: self.show_database_error("loading habits", e)
+        )
+
+    @staticmethod
+    def fetch_first_page():
+        """Query the first page of habits and the total; runs on a worker thread"""
+        db = get_db_manager()
+        habits, cursor = db.get_habits_page()
+        return habits, cursor, db.count_habits()
+
+    def on_habits_loaded(self, result):
+        """Take the freshly loaded habits and re-apply the current filters"""
+        self.habits, self.habits_cursor, self.habits_total = result
+        self.search_keys = {habit['id']: self.build_search_key(habit) for habit in self.habits}
+        print(f"Loaded {len(self.habits)} of {self.habits_total} habits")
+
+        if self.change_listener is None:
+            self.change_listener = self.habits_changed.emit
+            get_db_manager().add_change_listener(self.change_listener)
+        self.refresh.request('filters')
+
+    def show_database_error(self, action, error):
+        """Report a failed database job"""
+        print(f"Error {action}: {error}")
+        QMessageBox.critical(self, "Error", f"Error {action}: {error}")
 
     def update_habits_view(self):
-        """Refresh the habits display based on the current view mode."""
-        # Clear existing widgets and layout
-        if self.habit_layout is not None:
-            while self.habit_layout.count():
-                child = self.habit_layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
-            QWidget().setLayout(self.habit_layout)
-
-        # Create new layout based on view mode
-        if self.current_view_mode == 'grid':
-            self.habit_layout = QGridLayout()
-            self.habit_layout.setSpacing(20)
-            self.habit_layout.setContentsMargins(20, 20, 20, 20)
-
-            row, col = 0, 0
-            num_columns = 3
-            for habit in self.filtered_habits:
-                card = HabitCard(habit, view_mode='compact', parent=self)
-                card.edit_clicked.connect(self.edit_habit)
-                card.delete_clicked.connect(self.delete_habit)
-                card.status_changed.connect(self.change_habit_status)
-                card.details_clicked.connect(self.show_habit_details)
-                self.habit_layout.addWidget(card, row, col)
-                col += 1
-                if col >= num_columns:
-                    col = 0
-                    row += 1
-
-            # Make columns stretchable to fill width
-            for i in range(num_columns):
-                self.habit_layout.setColumnStretch(i, 1)
-
-            # Add a row stretch to push cards to the top
-            self.habit_layout.setRowStretch(row + 1, 1)
-
-        else:  # list view
-            self.habit_layout = QVBoxLayout()
-            self.habit_layout.setSpacing(10)
-            self.habit_layout.setContentsMargins(15, 15, 15, 15)
-
-            for habit in self.filtered_habits:
-                list_item = HabitListItem(habit, parent=self)
-                list_item.edit_clicked.connect(self.edit_habit)
-                list_item.delete_clicked.connect(self.delete_habit)
-                list_item.status_changed.connect(self.change_habit_status)
-                list_item.details_clicked.connect(self.show_habit_details)
-                self.habit_layout.addWidget(list_item)
-
-            self.habit_layout.addStretch(1)
-
-        self.habit_container.setLayout(self.habit_layout)
-        self.update_habit_count()
+        """Show filtered_habits in the habit view"""
+        # Diffed by habit id, so unchanged rows are neither rebuilt nor repainted
+        self.habit_model.set_habits(self.filtered_habits)
+        self.refresh.request('count')
+
+    @staticmethod
+    def find_habit(habits, habit_id):
+        """Index of habit_id in a list of habits, or None"""
+        for index, habit in enumerate(habits):
+            if habit['id'] == habit_id:
+                return index
+        return None
+
+    @staticmethod
+    def sorted_position(habits, habit, cursor):
+        """Index for habit in a newest-first list, or None if it belongs to a page not loaded yet"""
+        # The epoch, not the local time string, which sorts differently across a DST change
+        key = (habit['created_at_epoch'], habit['id'])
+        for index, other in enumerate(habits):
+            if (other['created_at_epoch'], other['id']) < key:
+                return index
+        return len(habits) if cursor is None else None
+
+    def habit_matches_filters(self, habit):
+        """Whether habit belongs in the current category/status filtered view"""
+        return all(habit.get(field) == self.active_filters[field]
+                   for field in ('category', 'status') if field in self.active_filters)
+
+    @staticmethod
+    def build_search_key(habit):
+        """(name words, name and notes words, name and notes text), all lowercase
+
+        Words are space-prefixed so " term" in a key is a word prefix match,
+        the same match the database's full-text search makes.
+        """
+        text = f"{habit.get('name') or ''} {habit.get('notes') or ''}".lower()
+        name_words = " " + " ".join(re.findall(r"\w+", (habit.get('name') or '').lower()))
+        return name_words, " " + " ".join(re.findall(r"\w+", text)), text
+
+    def filter_locally(self):
+        """Apply active_filters to the fully loaded habit list without the database
+
+        Like the database search, every word must start a word of the name
+        or notes; habits matching on their name come first.
+        """
+        search = self.active_filters.get('search', '').lower()
+        terms = [" " + term for term in re.findall(r"\w+", search)]
+
+        name_matches, other_matches = [], []
+        for habit in self.habits:
+            if not self.habit_matches_filters(habit):
+                continue
+            if not search:
+                name_matches.append(habit)
+                continue
+
+            name_words, words, text = self.search_keys[habit['id']]
+            if not terms:
+                # Nothing word-like typed, the database falls back to a substring match too
+                if search in text:
+                    name_matches.append(habit)
+            elif all(term in name_words for term in terms):
+                name_matches.append(habit)
+            elif all(term in words for term in terms):
+                other_matches.append(habit)
+
+        return name_matches + other_matches
+
+    def apply_habit_change(self, change):
+        """Patch the loaded habits and only the affected rows of the view with a database change"""
+        if change['reload'] or self.refresh.is_requested('habits') or self.db_executor.is_pending('habits'):
+            # A reload still in flight may have read the rows before this change
+            self.refresh.request('habits', 'statistics')
+            return
+
+        for habit_id in change['deleted']:
+            self.patch_deleted_habit(habit_id)
+        for habit in change['inserted']:
+            self.habits_total += 1
+            self.patch_habit(habit)
+        for habit in change['updated']:
+            self.patch_habit(habit)
+
+        if self.db_executor.is_pending('filter'):
+            # The query in flight may have read the rows before this change
+            self.refresh.request('filters')
+        elif 'search' in self.active_filters and (change['inserted'] or change['updated']):
+            # Only the search index knows whether and where the rows rank now
+            self.refresh.request('filters')
+
+        self.refresh.request('statistics', 'count')
+
+    def patch_deleted_habit(self, habit_id):
+        """Forget a deleted habit and drop it from the view"""
+        self.habits_total -= 1
+        self.search_keys.pop(habit_id, None)
+        habit = None
+        index = self.find_habit(self.habits, habit_id)
+        if index is not None:
+            habit = self.habits.pop(index)
+
+        index = self.find_habit(self.filtered_habits, habit_id)
+        if index is not None:
+            del self.filtered_habits[index]
+            self.filtered_total -= 1
+            self.habit_model.remove_habit(index)
+        elif not self.active_filters:
+            self.filtered_total -= 1
+        elif self.filtered_cursor is not None:
+            # Not loaded yet; it counted towards the total if it matched the filters
+            if habit is None:
+                self.refresh.request('filtered_count')
+            elif self.habit_matches_filters(habit):
+                self.filtered_total -= 1
+
+    def patch_habit(self, habit):
+        """Put a new or changed habit in place and repaint, add or drop its row in the view"""
+        index = self.find_habit(self.habits, habit['id'])
+        if index is not None:
+            self.habits[index] = habit
+            self.search_keys[habit['id']] = self.build_search_key(habit)
+        else:
+            position = self.sorted_position(self.habits, habit, self.habits_cursor)
+            if position is not None:
+                self.habits.insert(position, habit)
+                self.search_keys[habit['id']] = self.build_search_key(habit)
+
+        if 'search' in self.active_filters:
+            return
+
+        index = self.find_habit(self.filtered_habits, habit['id'])
+        if index is not None:
+            if self.habit_matches_filters(habit):
+                self.filtered_habits[index] = habit
+                self.habit_model.update_habit(index, habit)
+            else:
+                del self.filtered_habits[index]
+                self.filtered_total -= 1
+                self.habit_model.remove_habit(index)
+        elif self.habit_matches_filters(habit):
+            self.filtered_total += 1
+            position = self.sorted_position(self.filtered_habits, habit, self.filtered_cursor)
+            if position is not None:
+                self.filtered_habits.insert(position, habit)
+                self.habit_model.insert_habit(position, habit)
+
+    def update_filtered_total(self):
+        """Recount the rows of the current view when a change cannot tell how it moved"""
+        filters = dict(self.active_filters)
+        self.db_executor.submit(
+            lambda: get_db_manager().count_habits(filters), channel='filtered_count',
+            on_result=self.show_filtered_total,
+            on_error=lambda e: print(f"Error counting habits: {e}")
+        )
+
+    def show_filtered_total(self, total):
+        """Take a count made by update_filtered_total"""
+        self.filtered_total = total
+        self.refresh.request('count')
+
+    def on_habits_scrolled(self, value):
+        """Load the next page once the list is scrolled close to its end."""
+        scroll_bar = self.habit_view.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.load_more_habits()
+
+    def load_more_habits(self):
+        """Fetch the next page of the current view and append it."""
+        if self.filtered_cursor is None or self.db_executor.is_pending('filter'):
+            return
+
+        after, filters = self.filtered_cursor, dict(self.active_filters)
+        self.db_executor.submit(
+            lambda: get_db_manager().get_habits_page(after=after, filters=filters),
+            channel='filter', on_result=self.on_more_habits_loaded,
+            on_error=lambda e: print(f"Error loading more habits: {e}")
+        )
+
+    def on_more_habits_loaded(self, result):
+        """Append a page fetched by load_more_habits"""
+        rows, self.filtered_cursor = result
+
+        if not self.active_filters:
+            # Unfiltered pages are the habit list itself
+            self.habits.extend(rows)
+            self.habits_cursor = self.filtered_cursor
+            self.search_keys.update((habit['id'], self.build_search_key(habit)) for habit in rows)
+
+        self.filtered_habits.extend(rows)
+        self.habit_model.append_habits(rows)
+        self.refresh.request('count')
 
     def apply_filters(self):
         """Apply filters to habit list"""
+        # Applies the current search text, a pending debounced run is moot
+        self.filter_timer.stop()
         filters = {}
 
         category = self.category_filter.currentText()
@@ -834,12 +1046,46 @@ class MainWindow(QMainWindow):
         if search_text:
             filters['search'] = search_text
 
-        try:
-            self.filtered_habits = db_manager.get_all_habits(filters)
-            self.update_habits_view()
-            self.update_habit_count()
-        except Exception as e:
-            print(f"Error applying filters: {e}")
+        self.active_filters = filters
+        # A recount of the previous filters no longer applies
+        self.db_executor.cancel('filtered_count')
+        if not filters:
+            # Drop any older filtered query still in flight
+            self.db_executor.cancel('filter')
+            self.show_filtered_habits((self.habits.copy(), self.habits_cursor, self.habits_total))
+            return
+
+        if self.habits_cursor is None:
+            # Every habit is loaded, filtering in memory beats a query
+            self.db_executor.cancel('filter')
+            habits = self.filter_locally()
+            self.show_filtered_habits((habits, None, len(habits)))
+            return
+
+        # Only some pages are loaded, the database has to filter
+        self.db_executor.submit(
+            self.fetch_filtered_habits, filters, channel='filter',
+            on_result=self.show_filtered_habits,
+            on_error=lambda e: print(f"Error applying filters: {e}")
+        )
+
+    @staticmethod
+    def fetch_filtered_habits(filters):
+        """Query the first page of a filtered view and its total; runs on a worker thread"""
+        db = get_db_manager()
+        if 'search' in filters:
+            # Search results are ranked by relevance, so they come in one go
+            habits = db.get_all_habits(filters)
+            return habits, None, len(habits)
+
+        habits, cursor = db.get_habits_page(filters=filters)
+        total = len(habits) if cursor is None else db.count_habits(filters)
+        return habits, cursor, total
+
+    def show_filtered_habits(self, result):
+        """Display a filtered view produced by apply_filters"""
+        self.filtered_habits, self.filtered_cursor, self.filtered_total = result
+        self.update_habits_view()
 
     def clear_filters(self):
         """Clear all filters"""
@@ -848,7 +1094,8 @@ class MainWindow(QMainWindow):
         self.search_box.clear()
         self.category_filter.setCurrentIndex(0)
         self.status_filter.setCurrentIndex(0)
-        self.apply_filters()
+        # The widget signals above already asked for it, this covers a search still debouncing
+        self.refresh.request('filters')
 
     def set_view_mode(self, mode):
         """Set the view mode for habits (grid or list)."""
@@ -865,7 +1112,7 @@ class MainWindow(QMainWindow):
         self.list_view_button.style().unpolish(self.list_view_button)
         self.list_view_button.style().polish(self.list_view_button)
 
-        self.update_habits_view()
+        self.habit_view.set_view_mode(mode)
 
     def add_new_habit(self):
         """Show dialog to add new habit"""
@@ -875,38 +1122,39 @@ class MainWindow(QMainWindow):
 
     def save_new_habit(self, habit_data):
         """Save new habit"""
-        try:
-            habit_id = db_manager.create_habit(habit_data)
-            self.load_habits()
-            self.apply_filters()
-            QMessageBox.information(self, "Success", "Habit created successfully!")
-        except Exception as e:
-            print(f"Error saving habit: {e}")
-            QMessageBox.critical(self, "Error", f"Error saving habit: {e}")
+        self.db_executor.submit(
+            lambda: get_db_manager().create_habit(habit_data), write=True,
+            on_result=lambda habit_id: self.on_write_finished(True, "Habit created successfully!"),
+            on_error=lambda e: self.show_database_error("saving habit", e)
+        )
+
+    def on_write_finished(self, changed, message):
+        """Confirm a committed write; the view is patched by its change event"""
+        if changed:
+            QMessageBox.information(self, "Success", message)
 
     def edit_habit(self, habit_id):
         """Edit habit"""
-        try:
-            habit_data = db_manager.get_habit(habit_id)
-            if habit_data:
-                dialog = HabitDialog(self, habit_data)
-                dialog.habit_saved.connect(lambda data: self.update_habit(habit_id, data))
-                dialog.exec_()
-        except Exception as e:
-            print(f"Error editing habit: {e}")
-            QMessageBox.critical(self, "Error", f"Error editing habit: {e}")
+        self.db_executor.submit(
+            lambda: get_db_manager().get_habit(habit_id), channel='habit_dialog',
+            on_result=lambda habit_data: self.open_edit_dialog(habit_id, habit_data),
+            on_error=lambda e: self.show_database_error("editing habit", e)
+        )
+
+    def open_edit_dialog(self, habit_id, habit_data):
+        """Show the edit dialog for a habit fetched by edit_habit"""
+        if habit_data:
+            dialog = HabitDialog(self, habit_data)
+            dialog.habit_saved.connect(lambda data: self.update_habit(habit_id, data))
+            dialog.exec_()
 
     def update_habit(self, habit_id, habit_data):
         """Update habit"""
-        try:
-            success = db_manager.update_habit(habit_id, habit_data)
-            if success:
-                self.load_habits()
-                self.apply_filters()
-                QMessageBox.information(self, "Success", "Habit updated successfully!")
-        except Exception as e:
-            print(f"Error updating habit: {e}")
-            QMessageBox.critical(self, "Error", f"Error updating habit: {e}")
+        self.db_executor.submit(
+            lambda: get_db_manager().update_habit(habit_id, habit_data), write=True,
+            on_result=lambda success: self.on_write_finished(success, "Habit updated successfully!"),
+            on_error=lambda e: self.show_database_error("updating habit", e)
+        )
 
     def delete_habit(self, habit_id):
         """Delete habit"""
@@ -917,68 +1165,161 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                success = db_manager.delete_habit(habit_id)
-                if success:
-                    self.load_habits()
-                    self.apply_filters()
-                    QMessageBox.information(self, "Success", "Habit deleted successfully!")
-            except Exception as e:
-                print(f"Error deleting habit: {e}")
-                QMessageBox.critical(self, "Error", f"Error deleting habit: {e}")
+            self.db_executor.submit(
+                lambda: get_db_manager().delete_habit(habit_id), write=True,
+                on_result=lambda success: self.on_write_finished(success, "Habit deleted successfully!"),
+                on_error=lambda e: self.show_database_error("deleting habit", e)
+            )
 
     def change_habit_status(self, habit_id, new_status):
         """Change habit status"""
-        try:
-            habit_data = db_manager.get_habit(habit_id)
-            if habit_data:
-                habit_data['status'] = new_status
-                db_manager.update_habit(habit_id, habit_data)
-                self.load_habits()
-                self.apply_filters()
-        except Exception as e:
-            print(f"Error changing status: {e}")
+        self.db_executor.submit(
+            self.set_habit_status, habit_id, new_status, write=True,
+            on_error=lambda e: print(f"Error changing status: {e}")
+        )
+
+    @staticmethod
+    def set_habit_status(habit_id, new_status):
+        """Store a new status for a habit; runs on the write thread"""
+        db = get_db_manager()
+        habit_data = db.get_habit(habit_id)
+        if not habit_data:
+            return False
+        habit_data['status'] = new_status
+        return db.update_habit(habit_id, habit_data)
 
     def show_habit_details(self, habit_id: int):
         """Show habit details in a detailed dialog"""
-        try:
-            habit_data = db_manager.get_habit(habit_id)
-            if habit_data:
-                dialog = HabitDetailsDialog(habit_data, self)
-                dialog.status_change_requested.connect(self.change_habit_status)
-                dialog.exec_()
-            else:
-                QMessageBox.warning(self, "Error", "Habit not found!")
+        self.db_executor.submit(
+            lambda: get_db_manager().get_habit(habit_id), channel='habit_dialog',
+            on_result=self.open_details_dialog,
+            on_error=lambda e: self.show_database_error("showing habit details", e)
+        )
 
-        except Exception as e:
-            print(f"Error showing habit details: {e}")
-            QMessageBox.critical(self, "Error", f"Error showing habit details: {e}")
+    def open_details_dialog(self, habit_data):
+        """Show the details dialog for a habit fetched by show_habit_details"""
+        if habit_data:
+            dialog = HabitDetailsDialog(habit_data, self)
+            dialog.status_change_requested.connect(self.change_habit_status)
+            dialog.exec_()
+        else:
+            QMessageBox.warning(self, "Error", "Habit not found!")
 
     def refresh_habits(self):
         """Refresh habits"""
-        self.load_habits()
-        self.apply_filters()
+        self.refresh.request('habits', 'statistics')
         QMessageBox.information(self, "Success", "Habits refreshed!")
 
     def export_data(self, format_type):
         """Export data"""
-        try:
-            if format_type == 'pdf':
-                filepath = export_manager.export_to_pdf(self.filtered_habits)
-            else:
-                filepath = export_manager.export_to_csv(self.filtered_habits)
+        if self.filtered_cursor is not None:
+            # Only some pages are loaded, let the exporter stream the rest
+            filters = dict(self.active_filters)
+            export = lambda: get_export_manager().export_filtered_habits(filters, format_type)
+        elif format_type == 'pdf':
+            habits = list(self.filtered_habits)
+            export = lambda: get_export_manager().export_to_pdf(habits)
+        else:
+            habits = list(self.filtered_habits)
+            export = lambda: get_export_manager().export_to_csv(habits)
 
-            QMessageBox.information(self, "Success", f"Exported to {filepath}")
-        except Exception as e:
-            print(f"Error exporting: {e}")
-            QMessageBox.critical(self, "Error", f"Error exporting: {e}")
+        self.db_executor.submit(
+            export,
+            on_result=lambda filepath: QMessageBox.information(self, "Success", f"Exported to {filepath}"),
+            on_error=lambda e: self.show_database_error("exporting", e)
+        )
+
+    def setup_backup_schedule(self):
+        """Back up on a timer while the app runs, and at startup when the last backup is due"""
+        self.backup_progress.connect(self.show_backup_progress)
+        self.backup_timer = QTimer(self)
+        self.backup_timer.setInterval(BACKUP_INTERVAL_HOURS * 3600 * 1000)
+        self.backup_timer.timeout.connect(lambda: self.start_backup(scheduled=True))
+        self.backup_timer.start()
+        QTimer.singleShot(0, lambda: self.start_backup(scheduled=True))
+
+    def run_backup(self, scheduled):
+        """Back up and rotate; runs on a worker thread, skipping scheduled runs that aren't due"""
+        db = get_db_manager()
+        if scheduled:
+            backups = db.list_backups()
+            if backups and time.time() - os.path.getmtime(backups[0]) < BACKUP_INTERVAL_HOURS * 3600:
+                return None
+
+        path = db.backup(progress_callback=lambda step, total, message: self.backup_progress.emit(step, total))
+        db.rotate_backups()
+        return path
+
+    def start_backup(self, scheduled):
+        """Run a backup off the GUI thread; writers keep going while it copies"""
+        if self.db_executor.is_pending('backup'):
+            return
+        self.db_executor.submit(
+            self.run_backup, scheduled, channel='backup',
+            on_result=lambda path: self.on_backup_finished(path, scheduled),
+            on_error=lambda e: self.show_database_error("backing up database", e)
+        )
+
+    def on_backup_finished(self, path, scheduled):
+        """Report a finished backup"""
+        if path is None:
+            return
+        self.status_dynamic_label.setText(f"Backed up to {os.path.basename(path)}")
+        if not scheduled:
+            QMessageBox.information(self, "Success", f"Database backed up to {path}")
+
+    def show_backup_progress(self, step, total):
+        """Show how far a backup or restore has copied"""
+        percent = step * 100 // total if total else 100
+        self.status_dynamic_label.setText(f"Copying database... {percent}%")
+
+    def restore_backup(self):
+        """Pick a backup and replace the database contents with it"""
+        backups = get_db_manager().list_backups()
+        start_dir = os.path.dirname(backups[0]) if backups else ""
+        path, _ = QFileDialog.getOpenFileName(self, "Restore from Backup", start_dir, "Database backups (*.db)")
+        if not path:
+            return
+
+        reply = QMessageBox.question(
+            self, "Restore",
+            f"Replace all habits with the contents of {os.path.basename(path)}?\n"
+            "The current data is saved as a backup first.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        # On the write thread so it applies after writes already queued; the
+        # view reloads from the change event it publishes
+        self.db_executor.submit(
+            lambda: get_db_manager().restore(
+                path, progress_callback=lambda step, total, message: self.backup_progress.emit(step, total)),
+            write=True,
+            on_result=lambda safety_path: self.on_restore_finished(path, safety_path),
+            on_error=lambda e: self.show_database_error("restoring backup", e)
+        )
+
+    def on_restore_finished(self, path, safety_path):
+        """Report a finished restore"""
+        self.status_dynamic_label.setText(f"Restored {os.path.basename(path)}")
+        QMessageBox.information(self, "Success",
+                                f"Restored {path}\nPrevious data saved to {safety_path}")
 
     def update_statistics(self):
         """Update statistics"""
-        total = len(self.habits)
-        completed = sum(1 for h in self.habits if h.get('status') == 'Selesai')
-        pending = total - completed
-        completion_rate = (completed / total * 100) if total > 0 else 0
+        self.db_executor.submit(
+            lambda: get_db_manager().get_statistics(), channel='statistics',
+            on_result=self.show_statistics,
+            on_error=lambda e: print(f"Error loading statistics: {e}")
+        )
+
+    def show_statistics(self, stats):
+        """Display statistics fetched by update_statistics"""
+        total = stats['total_habits']
+        completed = stats['completed_habits']
+        pending = stats['pending_habits']
+        completion_rate = stats['completion_rate']
 
         # Update main statistics
         self.total_label.setText(str(total))
@@ -990,18 +1331,10 @@ class MainWindow(QMainWindow):
         self.completion_progress.setValue(int(completion_rate))
 
         # Update category breakdown
-        self.update_category_breakdown()
-
-        self.update_habit_count()
+        self.update_category_breakdown(stats['category_breakdown'])
 
-    def update_category_breakdown(self):
+    def update_category_breakdown(self, category_count: Dict[str, int]):
         """Update the category breakdown in the statistics panel."""
-        category_count = {cat: 0 for cat in HABIT_CATEGORIES}
-        for habit in self.habits:
-            category = habit.get('category', 'Unknown')
-            if category in category_count:
-                category_count[category] += 1
-
         for category, label in self.category_labels.items():
             count = category_count.get(category, 0)
             label.setText(f"∙ {category}: {count}")
@@ -1009,7 +1342,11 @@ class MainWindow(QMainWindow):
     def update_habit_count(self):
         """Update habit count label"""
         count = len(self.filtered_habits)
-        self.habit_count_label.setText(f"{count} habit{'s' if count != 1 else ''}")
+        total = max(self.filtered_total, count)
+        if total > count:
+            self.habit_count_label.setText(f"{count} of {total} habits")
+        else:
+            self.habit_count_label.setText(f"{count} habit{'s' if count != 1 else ''}")
 
     def show_about(self):
         """Show a custom styled about dialog."""
@@ -1075,6 +1412,14 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
+            # Let running jobs finish before their connections go away
+            self.backup_timer.stop()
+            self.db_executor.shutdown()
+            for name, counts in self.refresh.summary().items():
+                print(f"Refresh {name}: {counts['run']} run, {counts['avoided']} merged away")
+            if self.change_listener is not None:
+                get_db_manager().remove_change_listener(self.change_listener)
+            get_db_manager().close()
             event.accept()
         else:
             event.ignore()
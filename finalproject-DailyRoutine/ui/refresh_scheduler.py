@@ -0,0 +1,76 @@
+"""
+Coalescing refresh scheduler for DailyRoutine application
+"""
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+class RefreshScheduler(QObject):
+    """Runs each requested refresh part once per event-loop tick
+
+    Parts are registered in the order they have to run, e.g. fetching the
+    habits before filtering them before updating the count label. Requests
+    made before the next tick are merged, a part requested while an earlier
+    part runs still runs in the same pass, and a part can supersede others
+    that it brings up to date itself.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._parts: Dict[str, Callable[[], None]] = {}
+        self._supersedes: Dict[str, List[str]] = {}
+        self._requested = set()
+        self.requests = Counter()
+        self.runs = Counter()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def add_part(self, name: str, func: Callable[[], None], supersedes: Iterable[str] = ()):
+        """Register func as part name, running after the parts registered before it"""
+        self._parts[name] = func
+        self._supersedes[name] = list(supersedes)
+
+    def request(self, *names: str):
+        """Ask for the named parts to run on the next tick"""
+        for name in names:
+            if name not in self._parts:
+                raise ValueError(f"Unknown refresh part: {name}")
+            self.requests[name] += 1
+            self._requested.add(name)
+        self._timer.start()
+
+    def is_requested(self, name: str) -> bool:
+        """Whether part name is waiting for the next tick"""
+        return name in self._requested
+
+    def flush(self):
+        """Run the requested parts now, in registration order"""
+        self._timer.stop()
+        for name, func in self._parts.items():
+            if name not in self._requested:
+                continue
+            self._requested.discard(name)
+            self._requested.difference_update(self._supersedes[name])
+            self.runs[name] += 1
+            func()
+
+        if self._requested:
+            # Requested by a part for a part that already ran in this pass
+            self._timer.start()
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Requests, runs and runs avoided by merging, per part"""
+        return {
+            name: {
+                'requested': self.requests[name],
+                'run': self.runs[name],
+                'avoided': self.requests[name] - self.runs[name] - (1 if name in self._requested else 0),
+            }
+            for name in self._parts
+        }
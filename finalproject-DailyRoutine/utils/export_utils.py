@@ -6,16 +6,10 @@ import csv
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from typing import List, Dict, Any, Optional, Iterable
 
 from config.constants import EXPORT_DIR, AUTHOR, NIM, APP_NAME
-from database.database import db_manager
+from database.database import get_db_manager
 
 class ExportManager:
     """Manager for exporting habit data"""
@@ -28,8 +22,8 @@ class ExportManager:
         """Ensure export directory exists"""
         Path(self.export_dir).mkdir(parents=True, exist_ok=True)
 
-    def export_to_csv(self, habits: List[Dict[str, Any]], filename: str = None) -> str:
-        """Export habits to CSV file"""
+    def export_to_csv(self, habits: Iterable[Dict[str, Any]], filename: str = None) -> str:
+        """Export habits to CSV file, writing rows as they are produced"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"habits_{timestamp}.csv"
@@ -78,6 +72,14 @@ class ExportManager:
         filepath = os.path.join(self.export_dir, filename)
 
         try:
+            # reportlab is heavy to import, so it is only loaded for PDF exports
+            from reportlab.lib.pagesizes import A4
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.units import inch
+            from reportlab.lib import colors
+            from reportlab.lib.enums import TA_CENTER
+
             # Create PDF document
             doc = SimpleDocTemplate(filepath, pagesize=A4, topMargin=inch, bottomMargin=inch)
             styles = getSampleStyleSheet()
@@ -220,12 +222,11 @@ class ExportManager:
     def export_all_habits(self, format_type: str = 'pdf') -> str:
         """Export all habits in specified format"""
         try:
-            habits = db_manager.get_all_habits()
-
+            # CSV streams page by page, the PDF report needs the whole list
             if format_type.lower() == 'csv':
-                return self.export_to_csv(habits)
+                return self.export_to_csv(get_db_manager().iter_habits())
             elif format_type.lower() == 'pdf':
-                return self.export_to_pdf(habits)
+                return self.export_to_pdf(list(get_db_manager().iter_habits()))
             else:
                 raise ValueError(f"Unsupported format: {format_type}")
 
@@ -235,17 +236,29 @@ class ExportManager:
     def export_filtered_habits(self, filters: Dict[str, Any], format_type: str = 'pdf') -> str:
         """Export filtered habits in specified format"""
         try:
-            habits = db_manager.get_all_habits(filters)
-
+            # CSV streams page by page, the PDF report needs the whole list
             if format_type.lower() == 'csv':
-                return self.export_to_csv(habits)
+                return self.export_to_csv(get_db_manager().iter_habits(filters))
             elif format_type.lower() == 'pdf':
-                return self.export_to_pdf(habits)
+                return self.export_to_pdf(list(get_db_manager().iter_habits(filters)))
             else:
                 raise ValueError(f"Unsupported format: {format_type}")
 
         except Exception as e:
             raise Exception(f"Error exporting filtered habits: {e}")
 
-# Global export manager instance
-export_manager = ExportManager()
+# Shared export manager instance, created on first use
+_export_manager: Optional[ExportManager] = None
+
+def get_export_manager() -> ExportManager:
+    """Get the shared ExportManager, creating it on first use"""
+    global _export_manager
+    if _export_manager is None:
+        _export_manager = ExportManager()
+    return _export_manager
+
+def __getattr__(name: str) -> Any:
+    """Keep the old module-level export_manager attribute working lazily"""
+    if name == 'export_manager':
+        return get_export_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
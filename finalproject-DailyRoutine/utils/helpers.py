@@ -9,7 +9,7 @@ from pathlib import Path
 
 from config.constants import (
     HABIT_CATEGORIES, HABIT_PRIORITIES, HABIT_STATUS,
-    PRIORITY_COLORS, STATUS_COLORS, DATE_FORMAT, DISPLAY_DATE_FORMAT
+    PRIORITY_COLORS, STATUS_COLORS, DATE_FORMAT, DATETIME_FORMAT, DISPLAY_DATE_FORMAT
 )
 
 def format_date_for_display(date_str: str) -> str:
@@ -26,6 +26,41 @@ def format_date_for_database(date_obj: date) -> str:
     """Format date object for database storage"""
     return date_obj.isoformat()
 
+# Dates are stored as days since this day, timestamps as Unix epoch seconds
+EPOCH_DATE = date(1970, 1, 1)
+
+def date_to_day_number(value) -> int:
+    """Convert a date or an ISO date/datetime string to a stored day number"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    elif isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH_DATE).days
+
+def day_number_to_date(day_number: int) -> date:
+    """Convert a stored day number back to a date"""
+    return EPOCH_DATE + timedelta(days=day_number)
+
+def format_day_number(day_number: Optional[int]) -> Optional[str]:
+    """Format a stored day number as an ISO date string"""
+    if day_number is None:
+        return None
+    return day_number_to_date(day_number).isoformat()
+
+def datetime_to_epoch(value=None) -> int:
+    """Convert a local datetime or ISO datetime string to epoch seconds, now when omitted"""
+    if value is None:
+        value = datetime.now()
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())
+
+def format_epoch(epoch: Optional[int]) -> Optional[str]:
+    """Format stored epoch seconds as a local DATETIME_FORMAT string"""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch).strftime(DATETIME_FORMAT)
+
 def get_priority_color(priority: str) -> str:
     """Get color for priority level"""
     return PRIORITY_COLORS.get(priority, "#7f8c8d")